@@ -0,0 +1,33 @@
+"""Run the API server: ``python -m app``.
+
+Host, port and worker count come from Settings (HOST, PORT, WORKERS).
+"""
+import logging
+import os
+import secrets
+
+import uvicorn
+from sqlalchemy.engine import make_url
+
+from .config import get_settings
+from .workers import RUN_ID_ENV
+
+logger = logging.getLogger(__name__)
+
+
+def main():
+    settings = get_settings()
+    url = make_url(settings.database_url)
+    if settings.workers > 1 and url.get_backend_name() == "sqlite":
+        if url.database in (None, "", ":memory:"):
+            raise SystemExit("WORKERS > 1 needs a file database; in-memory SQLite is private to each process")
+        if settings.sqlite_journal_mode.lower() != "wal":
+            logger.warning("WORKERS > 1 with SQLITE_JOURNAL_MODE=%s: readers will block behind writers",
+                           settings.sqlite_journal_mode)
+    # Lets the workers of this run do the startup work once between them (see workers.startup_once)
+    os.environ[RUN_ID_ENV] = secrets.token_hex(8)
+    uvicorn.run("app.main:app", host=settings.host, port=settings.port, workers=settings.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""Vectorized trend analytics over daily entries.
+
+Data is pulled once as narrow column tuples and laid out as dense per-day
+NumPy arrays (one slot per calendar day), so rolling statistics are a few
+cumulative-sum passes regardless of how many years are covered.
+"""
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from . import models
+from .cache import MISSING, query_cache
+
+TREND_WINDOWS = (7, 30)
+
+
+@dataclass
+class DailyMatrix:
+    """Dense per-day columns for [start, start + days)"""
+    start: date
+    logged: np.ndarray  # bool, an entry exists for the day
+    stress: np.ndarray  # float, NaN when not logged or no stress level
+    worked_out: np.ndarray  # bool
+    issue_types: list[str]
+    issue_days: np.ndarray  # bool, shape (len(issue_types), days)
+
+    @property
+    def days(self) -> int:
+        return len(self.logged)
+
+    def dates(self) -> list[date]:
+        return [self.start + timedelta(days=i) for i in range(self.days)]
+
+
+def load_daily_matrix(db: Session, start: date, end: date) -> DailyMatrix:
+    """Build the per-day column matrix for [start, end] from one outer join"""
+    entry = models.DailyEntry
+    issue = models.HealthIssue
+    rows = db.execute(
+        select(entry.date, entry.stress_level, entry.worked_out, issue.issue_type)
+        .outerjoin(issue, issue.daily_entry_id == entry.id)
+        .where(entry.date.between(start, end))
+    ).all()
+
+    days = (end - start).days + 1
+    logged = np.zeros(days, dtype=bool)
+    stress = np.full(days, np.nan)
+    worked_out = np.zeros(days, dtype=bool)
+    if not rows:
+        return DailyMatrix(start, logged, stress, worked_out, [], np.zeros((0, days), dtype=bool))
+
+    entry_dates, stress_levels, workouts, types = zip(*rows)
+    offsets = np.fromiter((d.toordinal() for d in entry_dates), dtype=np.int64, count=len(rows)) - start.toordinal()
+    logged[offsets] = True
+    stress[offsets] = np.array(stress_levels, dtype=float)  # None becomes NaN
+    worked_out[offsets] = np.array(workouts, dtype=bool)
+
+    types = np.array(types, dtype=object)
+    has_issue = types != None  # noqa: E711 - elementwise comparison
+    issue_types, type_index = np.unique(types[has_issue].astype(str), return_inverse=True)
+    issue_days = np.zeros((len(issue_types), days), dtype=bool)
+    issue_days[type_index, offsets[has_issue]] = True
+
+    return DailyMatrix(start, logged, stress, worked_out, issue_types.tolist(), issue_days)
+
+
+def rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing-window sum along the last axis (partial windows at the start)"""
+    values = np.asarray(values, dtype=float)
+    totals = np.concatenate([np.zeros(values.shape[:-1] + (1,)), np.cumsum(values, axis=-1)], axis=-1)
+    ends = np.arange(1, values.shape[-1] + 1)
+    return totals[..., ends] - totals[..., np.maximum(ends - window, 0)]
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(denominator > 0, numerator / denominator, np.nan)
+
+
+def _to_list(values: np.ndarray) -> list[float | None]:
+    rounded = np.round(values, 2) + 0.0  # normalizes -0.0
+    return [None if np.isnan(v) else v for v in rounded.tolist()]
+
+
+def get_trends(db: Session, start_date: date, end_date: date) -> dict:
+    """Rolling stress means, workout frequency and issue incidence per day"""
+    warmup = max(TREND_WINDOWS) - 1
+    matrix = load_daily_matrix(db, start_date - timedelta(days=warmup), end_date)
+    visible = slice(warmup, None)
+
+    has_stress = ~np.isnan(matrix.stress)
+    stress_values = np.where(has_stress, matrix.stress, 0.0)
+
+    result = {
+        "start_date": start_date,
+        "end_date": end_date,
+        "dates": matrix.dates()[visible],
+        "issue_incidence": {},
+    }
+    for window in TREND_WINDOWS:
+        stress_mean = _ratio(rolling_sum(stress_values, window), rolling_sum(has_stress, window))
+        result[f"stress_mean_{window}d"] = _to_list(stress_mean[visible])
+        result[f"workout_rate_{window}d"] = _to_list(rolling_sum(matrix.worked_out, window)[visible] / window)
+
+    # Share of logged days in the trailing 30 days on which each issue occurred
+    window = max(TREND_WINDOWS)
+    incidence = _ratio(rolling_sum(matrix.issue_days, window), rolling_sum(matrix.logged, window))
+    for name, row in zip(matrix.issue_types, incidence):
+        result["issue_incidence"][name] = _to_list(row[visible])
+
+    return result
+
+
+def _history_matrix(db: Session) -> DailyMatrix | None:
+    """Matrix over the whole entry history, cached until the next entry write"""
+    key = ("entries", "daily_matrix")
+    matrix = query_cache.get(key)
+    if matrix is MISSING:
+        generation = query_cache.generation(key)
+        first, last = db.execute(select(func.min(models.DailyEntry.date), func.max(models.DailyEntry.date))).one()
+        matrix = load_daily_matrix(db, first, last) if first else None
+        query_cache.set(key, matrix, generation)
+    return matrix
+
+
+def _rate(events: np.ndarray, condition: np.ndarray) -> np.ndarray:
+    """Per-issue share of days matching condition on which the issue occurred"""
+    return _ratio(events[:, condition].sum(axis=1), np.full(len(events), condition.sum()))
+
+
+def _lagged_correlation(x: np.ndarray, x_valid: np.ndarray, events: np.ndarray, valid: np.ndarray, lag: int) -> np.ndarray:
+    """Pearson r between x on day t - lag and each issue row on day t, for all issues at once"""
+    if lag:
+        x, x_valid, events, valid = x[:-lag], x_valid[:-lag], events[:, lag:], valid[lag:]
+    mask = x_valid & valid
+    if mask.sum() < 2:
+        return np.full(len(events), np.nan)
+    xs = x[mask] - x[mask].mean()
+    ys = events[:, mask].astype(float)
+    ys -= ys.mean(axis=1, keepdims=True)
+    return _ratio(ys @ xs, np.sqrt((ys ** 2).sum(axis=1) * (xs ** 2).sum()))
+
+
+def get_correlation_report(db: Session, high_stress: int = 7, max_lag: int = 3) -> dict:
+    """Conditional issue rates and lagged correlations against stress and workouts.
+
+    Only logged days count. Served from cache until an entry write bumps the
+    "entries" namespace, and computed for every issue type in one pass.
+    """
+    key = ("entries", "correlations", high_stress, max_lag)
+    report = query_cache.get(key)
+    if report is not MISSING:
+        return report
+    generation = query_cache.generation(key)
+
+    matrix = _history_matrix(db)
+    report = {"days_analyzed": 0, "high_stress_threshold": high_stress, "max_lag": max_lag, "issues": []}
+    if matrix is None:
+        query_cache.set(key, report, generation)
+        return report
+
+    logged = matrix.logged
+    events = matrix.issue_days
+    has_stress = logged & ~np.isnan(matrix.stress)
+    stress = np.where(has_stress, matrix.stress, 0.0)
+    worked_out = matrix.worked_out.astype(float)
+
+    columns = {
+        "days_with_issue": events.sum(axis=1),
+        "base_rate": _rate(events, logged),
+        "rate_high_stress": _rate(events, has_stress & (stress >= high_stress)),
+        "rate_low_stress": _rate(events, has_stress & (stress < high_stress)),
+        "rate_workout": _rate(events, logged & matrix.worked_out),
+        "rate_no_workout": _rate(events, logged & ~matrix.worked_out),
+    }
+    lags = range(max_lag + 1)
+    stress_r = np.array([_lagged_correlation(stress, has_stress, events, logged, lag) for lag in lags]).T
+    workout_r = np.array([_lagged_correlation(worked_out, logged, events, logged, lag) for lag in lags]).T
+
+    report["days_analyzed"] = int(logged.sum())
+    for i, name in enumerate(matrix.issue_types):
+        report["issues"].append({
+            "issue_type": name,
+            "days_with_issue": int(columns["days_with_issue"][i]),
+            **{
+                column: _to_list(values[i:i + 1])[0]
+                for column, values in columns.items() if column != "days_with_issue"
+            },
+            "stress_correlation": _to_list(stress_r[i]),
+            "workout_correlation": _to_list(workout_r[i]),
+        })
+
+    query_cache.set(key, report, generation)
+    return report
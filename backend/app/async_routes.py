@@ -0,0 +1,60 @@
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date
+from typing import Optional
+
+from . import crud, schemas
+from .config import get_settings
+from .database import get_async_db
+from .routes import _before_from_cursor, _conditional_get, _fast_json, _set_next_cursor
+
+# Async versions of the hot read endpoints. Included ahead of the sync router
+# when settings.async_db is set, so these shadow their sync counterparts.
+router = APIRouter(prefix="/api")
+settings = get_settings()
+
+
+@router.get("/entries", response_model=list[schemas.DailyEntry], dependencies=[_conditional_get("entries", "devices")])
+async def list_entries_async(
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(30, le=100),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    before: Optional[date] = None,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get daily entries with optional date filtering"""
+    read = crud.get_daily_entry_rows_async if settings.fast_json else crud.get_daily_entries_async
+    entries = await read(
+        db,
+        skip=skip,
+        limit=limit,
+        start_date=start_date,
+        end_date=end_date,
+        before=_before_from_cursor(cursor, before),
+    )
+    _set_next_cursor(response, entries, limit)
+    return _fast_json(entries, response) if settings.fast_json else entries
+
+
+@router.get("/stats", response_model=schemas.StatsResponse, dependencies=[_conditional_get("entries")])
+async def get_stats_async(
+    days: int = Query(30, ge=1, le=365),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get health statistics for the past N days"""
+    return await crud.get_stats_async(db, days=days)
+
+
+@router.get("/today", response_model=Optional[schemas.DailyEntry], dependencies=[_conditional_get("entries", "devices")])
+async def get_today_async(db: AsyncSession = Depends(get_async_db)):
+    """Get today's entry or null if not created"""
+    return await crud.get_daily_entry_async(db, date.today())
+
+
+@router.get("/workouts/today", response_model=Optional[schemas.WorkoutDay], dependencies=[_conditional_get("workouts")])
+async def get_todays_workout_async(db: AsyncSession = Depends(get_async_db)):
+    """Get today's scheduled workout based on day of week"""
+    return await crud.get_todays_workout_async(db)
@@ -0,0 +1,122 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+from typing import Callable
+
+from .config import get_settings
+
+MISSING = object()
+
+
+class TTLCache:
+    """Size-bounded LRU cache whose entries also expire after a fixed TTL.
+
+    Keys are tuples whose first element is a namespace, so a whole family of
+    entries (e.g. every issue-type listing) can be dropped with invalidate().
+
+    A read that misses should take generation(key) before querying and pass
+    it to set(): if the namespace was invalidated in between, the value may
+    predate that write and is not stored.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float = 300.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[tuple, tuple[float, object]] = OrderedDict()
+        self._generations: defaultdict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: tuple, default=MISSING):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or item[0] < time.monotonic():
+                if item is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def generation(self, key: tuple) -> int:
+        """Invalidation count of the key's namespace"""
+        with self._lock:
+            return self._generations[key[0]]
+
+    def set(self, key: tuple, value, generation: int | None = None):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self._generations[key[0]]:
+                return  # invalidated while the value was being read
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, namespace: str):
+        with self._lock:
+            self._generations[namespace] += 1
+            for key in [k for k in self._data if k[0] == namespace]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            for namespace in {key[0] for key in self._data}:
+                self._generations[namespace] += 1
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+class DataVersions:
+    """Per-namespace write counters, bumped by the crud mutators after commit.
+
+    Combined with a boot id they identify a data version, which the read
+    endpoints turn into ETags. In multi-worker mode app.workers installs a
+    publisher that keeps the counters in the database so every process agrees
+    on them; the boot id then comes from the database too.
+    """
+
+    def __init__(self):
+        self.boot_id = uuid.uuid4().hex
+        self._versions: defaultdict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self.publisher: Callable[[str], int] | None = None
+
+    def bump(self, namespace: str):
+        if self.publisher is not None:
+            self.merge({namespace: self.publisher(namespace)})
+            return
+        with self._lock:
+            self._versions[namespace] += 1
+
+    def get(self, *namespaces: str) -> tuple[int, ...]:
+        with self._lock:
+            return tuple(self._versions[ns] for ns in namespaces)
+
+    def merge(self, versions: dict[str, int]) -> list[str]:
+        """Adopt counters published by any process; returns the namespaces that moved"""
+        with self._lock:
+            changed = [ns for ns, version in versions.items() if self._versions[ns] != version]
+            for ns in changed:
+                self._versions[ns] = versions[ns]
+            return changed
+
+
+_settings = get_settings()
+query_cache = TTLCache(maxsize=_settings.cache_max_entries, ttl=_settings.cache_ttl_seconds)
+data_versions = DataVersions()
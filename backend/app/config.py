@@ -1,6 +1,8 @@
+from pydantic import field_validator
 from pydantic_settings import BaseSettings
 from functools import lru_cache
 from pathlib import Path
+from typing import Literal
 
 
 # Ensure data directory exists
@@ -11,7 +13,57 @@ DATA_DIR.mkdir(exist_ok=True)
 class Settings(BaseSettings):
     app_name: str = "Healthify"
     database_url: str = f"sqlite:///{DATA_DIR}/healthify.db"
+    # `python -m app` server; more than one worker shares caches through the database
+    host: str = "0.0.0.0"
+    port: int = 8000
+    workers: int = 1
+    # Serve the hot read endpoints through an aiosqlite AsyncSession instead of the threadpool
+    async_db: bool = False
     cors_origins: list[str] = ["http://localhost:5173", "http://localhost:3000", "http://localhost:4173"]
+    # Request timing, query counts, Server-Timing headers and /api/metrics; off adds no overhead
+    metrics_enabled: bool = False
+    # Log SQL slower than this many ms with its calling function (0 disables), optionally with its plan
+    slow_query_ms: float = 0
+    slow_query_explain: bool = False
+    # Requests sending "X-Profile: <token>" get a sampled CPU profile back; empty disables profiling
+    profiling_token: str = ""
+    # Serve /api/entries and /api/workouts as orjson-encoded rows, skipping response_model validation
+    fast_json: bool = False
+    # Gzip responses of at least this many bytes for clients that accept it (0 disables)
+    gzip_min_size: int = 0
+
+    # In-process cache for near-static reads (issue types, today's workout); 0 entries disables it
+    cache_max_entries: int = 128
+    cache_ttl_seconds: float = 300.0
+
+    # Wearable samples are buffered in memory and written in batches
+    device_buffer_max_samples: int = 5000  # flush as soon as this many are waiting
+    device_flush_interval_seconds: float = 2.0
+    device_buffer_limit: int = 100000  # ingestion answers 503 while this many are waiting
+    device_flush_max_attempts: int = 5  # samples still failing after this many flushes are dropped
+
+    # Connection pool for server databases (PostgreSQL); SQLite ignores these
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_pre_ping: bool = True  # test connections on checkout so restarts don't surface as errors
+    db_pool_recycle: int = 1800  # seconds before a pooled connection is replaced
+    db_pool_timeout: int = 30  # seconds to wait for a free connection
+
+    # SQLite pragmas applied to every new connection
+    # wal lets readers run alongside the writer
+    sqlite_journal_mode: Literal["delete", "truncate", "persist", "memory", "wal", "off"] = "wal"
+    # fsync on checkpoint only; safe with WAL
+    sqlite_synchronous: Literal["off", "normal", "full", "extra"] = "normal"
+    sqlite_mmap_size: int = 256 * 1024 * 1024  # bytes, 0 disables memory-mapped I/O
+    sqlite_cache_size: int = -64000  # negative = KiB, positive = pages
+    sqlite_temp_store: Literal["default", "file", "memory"] = "memory"
+    sqlite_busy_timeout: int = 5000  # ms to wait on a locked database before failing
+
+    @field_validator("sqlite_journal_mode", "sqlite_synchronous", "sqlite_temp_store", mode="before")
+    @classmethod
+    def _pragma_keyword(cls, value):
+        # These are interpolated into PRAGMA statements, so only the keywords SQLite knows get through
+        return value.lower() if isinstance(value, str) else value
 
     class Config:
         env_file = ".env"
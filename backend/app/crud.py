@@ -1,32 +1,175 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import Date, Select, and_, case, delete, func, desc, insert, literal, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from collections import Counter, defaultdict
 from datetime import date, timedelta
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+import binascii
 from . import models, schemas
+from .cache import MISSING, data_versions, query_cache
+from .database import dialect_insert
+from .rollups import buckets_filter, cover_range, period_end, refresh_rollups
+
+
+def _data_changed(namespace: str):
+    """Record a committed write: bump the ETag version and drop cached reads"""
+    data_versions.bump(namespace)
+    query_cache.invalidate(namespace)
+
+
+def _daily_entry_stmt(entry_date: date) -> Select:
+    return select(models.DailyEntry).options(
+        selectinload(models.DailyEntry.health_issues),
+        selectinload(models.DailyEntry.device_summaries),
+    ).where(models.DailyEntry.date == entry_date)
 
 
 def get_daily_entry(db: Session, entry_date: date) -> models.DailyEntry | None:
-    return db.query(models.DailyEntry).filter(models.DailyEntry.date == entry_date).first()
+    return db.scalars(_daily_entry_stmt(entry_date)).first()
 
 
 def get_daily_entry_by_id(db: Session, entry_id: int) -> models.DailyEntry | None:
     return db.query(models.DailyEntry).filter(models.DailyEntry.id == entry_id).first()
 
 
+def _daily_entries_stmt(
+    skip: int,
+    limit: int,
+    start_date: date | None,
+    end_date: date | None,
+    before: date | None,
+) -> Select:
+    # Load all issues (and device summaries) for the page in one extra query each instead of one per entry
+    stmt = select(models.DailyEntry).options(
+        selectinload(models.DailyEntry.health_issues),
+        selectinload(models.DailyEntry.device_summaries),
+    )
+    return _entry_page(stmt, skip, limit, start_date, end_date, before)
+
+
+def _entry_page(
+    stmt: Select,
+    skip: int,
+    limit: int,
+    start_date: date | None,
+    end_date: date | None,
+    before: date | None,
+) -> Select:
+    if start_date:
+        stmt = stmt.where(models.DailyEntry.date >= start_date)
+    if end_date:
+        stmt = stmt.where(models.DailyEntry.date <= end_date)
+    if before:
+        # Keyset pagination: seek on the unique date index instead of scanning past `skip` rows
+        stmt = stmt.where(models.DailyEntry.date < before)
+
+    return stmt.order_by(desc(models.DailyEntry.date)).offset(skip).limit(limit)
+
+
 def get_daily_entries(
     db: Session,
     skip: int = 0,
     limit: int = 30,
     start_date: date | None = None,
-    end_date: date | None = None
+    end_date: date | None = None,
+    before: date | None = None,
 ) -> list[models.DailyEntry]:
-    query = db.query(models.DailyEntry)
+    return list(db.scalars(_daily_entries_stmt(skip, limit, start_date, end_date, before)))
+
+
+# Narrow readers for the FAST_JSON response path: plain dicts shaped like
+# schemas.DailyEntry / schemas.WorkoutRoutine, read as column tuples so that
+# neither ORM objects nor a second response_model validation are built.
+
+def _entry_rows_stmt(
+    skip: int,
+    limit: int,
+    start_date: date | None,
+    end_date: date | None,
+    before: date | None,
+) -> Select:
+    e = models.DailyEntry
+    stmt = select(
+        e.date, e.stress_level, e.worked_out, e.workout_notes, e.notes,
+        e.id, e.device_metrics, e.created_at, e.updated_at,
+    )
+    return _entry_page(stmt, skip, limit, start_date, end_date, before)
+
+
+def _entry_children_stmts(entries) -> tuple[Select, Select]:
+    issue = models.HealthIssue
+    summary = models.DeviceDailySummary
+    issues = select(
+        issue.issue_type, issue.severity, issue.notes, issue.time_of_day,
+        issue.id, issue.daily_entry_id, issue.created_at,
+    ).where(issue.daily_entry_id.in_([row.id for row in entries])).order_by(issue.daily_entry_id, issue.id)
+    summaries = select(
+        summary.date, summary.metric, summary.count, summary.total, summary.min_value, summary.max_value,
+    ).where(summary.date.in_([row.date for row in entries])).order_by(summary.metric)
+    return issues, summaries
+
+
+def _assemble_entry_rows(entries, issues, summaries) -> list[dict]:
+    rows = []
+    by_id, by_date = {}, {}
+    for entry in entries:
+        row = {
+            "date": entry.date,
+            "stress_level": entry.stress_level,
+            "worked_out": entry.worked_out,
+            "workout_notes": entry.workout_notes,
+            "notes": entry.notes,
+            "id": entry.id,
+            "health_issues": [],
+            "device_summaries": [],
+            "device_metrics": entry.device_metrics,
+            "created_at": entry.created_at,
+            "updated_at": entry.updated_at,
+        }
+        rows.append(row)
+        by_id[entry.id] = row
+        by_date[entry.date] = row
+    for issue in issues:
+        by_id[issue.daily_entry_id]["health_issues"].append(issue._asdict())
+    for summary in summaries:
+        by_date[summary.date]["device_summaries"].append({
+            "metric": summary.metric,
+            "count": summary.count,
+            "total": summary.total,
+            "min_value": summary.min_value,
+            "max_value": summary.max_value,
+        })
+    return rows
+
+
+def get_daily_entry_rows(
+    db: Session,
+    skip: int = 0,
+    limit: int = 30,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    before: date | None = None,
+) -> list[dict]:
+    """get_daily_entries as plain dicts, in the same three queries"""
+    entries = db.execute(_entry_rows_stmt(skip, limit, start_date, end_date, before)).all()
+    if not entries:
+        return []
+    issues, summaries = _entry_children_stmts(entries)
+    return _assemble_entry_rows(entries, db.execute(issues).all(), db.execute(summaries).all())
 
-    if start_date:
-        query = query.filter(models.DailyEntry.date >= start_date)
-    if end_date:
-        query = query.filter(models.DailyEntry.date <= end_date)
 
-    return query.order_by(desc(models.DailyEntry.date)).offset(skip).limit(limit).all()
+def encode_entry_cursor(entry_date: date) -> str:
+    """Opaque cursor pointing just past the given entry date"""
+    return urlsafe_b64encode(entry_date.isoformat().encode()).decode().rstrip("=")
+
+
+def decode_entry_cursor(cursor: str) -> date:
+    """Inverse of encode_entry_cursor; raises ValueError on a malformed cursor"""
+    try:
+        raw = urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except (binascii.Error, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+    return date.fromisoformat(raw)
 
 
 def create_daily_entry(db: Session, entry: schemas.DailyEntryCreate) -> models.DailyEntry:
@@ -50,11 +193,106 @@ def create_daily_entry(db: Session, entry: schemas.DailyEntryCreate) -> models.D
         )
         db.add(db_issue)
 
+    db.flush()
+    refresh_rollups(db, [db_entry.date])
     db.commit()
+    _data_changed("entries")
     db.refresh(db_entry)
     return db_entry
 
 
+def bulk_upsert_daily_entries(
+    db: Session,
+    entries: list[schemas.DailyEntryCreate]
+) -> tuple[int, int]:
+    """Create or replace a batch of entries in one transaction.
+
+    Entries are upserted on date with a single executemany, and their health
+    issues are replaced wholesale. Returns (created, updated).
+    """
+    by_date = {entry.date: entry for entry in entries}  # last row wins on duplicate dates
+    if not by_date:
+        return 0, 0
+
+    existing = set(db.scalars(
+        select(models.DailyEntry.date).where(models.DailyEntry.date.in_(by_date))
+    ))
+
+    table = models.DailyEntry.__table__
+    stmt = dialect_insert(db, table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.date],
+        set_={
+            "stress_level": stmt.excluded.stress_level,
+            "worked_out": stmt.excluded.worked_out,
+            "workout_notes": stmt.excluded.workout_notes,
+            "notes": stmt.excluded.notes,
+            "updated_at": func.now(),
+        },
+    )
+    db.execute(stmt, [entry.model_dump(exclude={"health_issues"}) for entry in by_date.values()])
+
+    entry_ids = dict(db.execute(
+        select(models.DailyEntry.date, models.DailyEntry.id).where(models.DailyEntry.date.in_(by_date))
+    ).all())
+
+    if existing:
+        db.execute(
+            delete(models.HealthIssue).where(
+                models.HealthIssue.daily_entry_id.in_([entry_ids[d] for d in existing])
+            )
+        )
+
+    issue_rows = [
+        {"daily_entry_id": entry_ids[entry_date], **issue.model_dump()}
+        for entry_date, entry in by_date.items()
+        for issue in entry.health_issues
+    ]
+    if issue_rows:
+        db.execute(insert(models.HealthIssue.__table__), issue_rows)
+
+    refresh_rollups(db, by_date)
+    db.commit()
+    _data_changed("entries")
+    return len(by_date) - len(existing), len(existing)
+
+
+def _issue_key(issue) -> tuple[str, str | None]:
+    return issue.issue_type, issue.time_of_day
+
+
+def sync_health_issues(db_entry: models.DailyEntry, issues: list[schemas.HealthIssueCreate]) -> bool:
+    """Bring an entry's issues in line with `issues` using the fewest writes.
+
+    Issues are matched on (issue_type, time_of_day): matches keep their row
+    and are only updated when severity or notes changed, unmatched rows are
+    deleted and the rest inserted. Returns whether anything changed.
+    """
+    existing = defaultdict(list)
+    for db_issue in db_entry.health_issues:
+        existing[_issue_key(db_issue)].append(db_issue)
+
+    changed = False
+    for issue in issues:
+        matches = existing.get(_issue_key(issue))
+        if matches:
+            db_issue = matches.pop(0)
+            for field in ("severity", "notes"):
+                value = getattr(issue, field)
+                if getattr(db_issue, field) != value:
+                    setattr(db_issue, field, value)
+                    changed = True
+        else:
+            db_entry.health_issues.append(models.HealthIssue(**issue.model_dump()))
+            changed = True
+
+    for leftovers in existing.values():
+        for db_issue in leftovers:
+            db_entry.health_issues.remove(db_issue)  # delete-orphan issues the DELETE
+            changed = True
+    return changed
+
+
 def update_daily_entry(
     db: Session,
     entry_date: date,
@@ -69,22 +307,42 @@ def update_daily_entry(
         setattr(db_entry, field, value)
 
     if entry_update.health_issues is not None:
-        # Clear existing issues and add new ones
-        db.query(models.HealthIssue).filter(
-            models.HealthIssue.daily_entry_id == db_entry.id
-        ).delete()
-
-        for issue in entry_update.health_issues:
-            db_issue = models.HealthIssue(
-                daily_entry_id=db_entry.id,
-                issue_type=issue.issue_type,
-                severity=issue.severity,
-                notes=issue.notes,
-                time_of_day=issue.time_of_day,
-            )
-            db.add(db_issue)
+        sync_health_issues(db_entry, entry_update.health_issues)
 
+    db.flush()
+    refresh_rollups(db, [db_entry.date])
     db.commit()
+    _data_changed("entries")
+    db.refresh(db_entry)
+    return db_entry
+
+
+def toggle_health_issue(
+    db: Session,
+    entry_date: date,
+    toggle: schemas.HealthIssueToggle
+) -> models.DailyEntry | None:
+    """Add, update or remove a single issue on an entry"""
+    db_entry = get_daily_entry(db, entry_date)
+    if not db_entry:
+        return None
+
+    key = _issue_key(toggle)
+    issues = [
+        schemas.HealthIssueCreate.model_validate(db_issue, from_attributes=True)
+        for db_issue in db_entry.health_issues
+        if _issue_key(db_issue) != key
+    ]
+    if toggle.selected:
+        issues.append(schemas.HealthIssueCreate(**toggle.model_dump(exclude={"selected"})))
+
+    if not sync_health_issues(db_entry, issues):
+        return db_entry
+
+    db.flush()
+    refresh_rollups(db, [db_entry.date])
+    db.commit()
+    _data_changed("entries")
     db.refresh(db_entry)
     return db_entry
 
@@ -95,72 +353,222 @@ def delete_daily_entry(db: Session, entry_date: date) -> bool:
         return False
 
     db.delete(db_entry)
+    db.flush()
+    refresh_rollups(db, [entry_date])
     db.commit()
+    _data_changed("entries")
     return True
 
 
-def get_issue_types(db: Session, active_only: bool = True) -> list[models.IssueType]:
+def iter_entries_with_issues(db: Session, batch_size: int = 1000):
+    """Yield every entry as a dict with its issues, oldest first.
+
+    Streams a single entry/issue outer join with yield_per so memory stays
+    flat regardless of history size; rows for one entry arrive adjacent.
+    """
+    entry = models.DailyEntry
+    issue = models.HealthIssue
+    stmt = select(
+        entry.id,
+        entry.date,
+        entry.stress_level,
+        entry.worked_out,
+        entry.workout_notes,
+        entry.notes,
+        entry.device_metrics,
+        entry.created_at,
+        entry.updated_at,
+        issue.issue_type,
+        issue.severity,
+        issue.notes.label("issue_notes"),
+        issue.time_of_day,
+    ).outerjoin(issue, issue.daily_entry_id == entry.id).order_by(
+        entry.date, issue.id
+    ).execution_options(yield_per=batch_size)
+
+    current = None
+    for row in db.execute(stmt):
+        if current is None or current["id"] != row.id:
+            if current is not None:
+                yield current
+            current = {
+                "id": row.id,
+                "date": row.date,
+                "stress_level": row.stress_level,
+                "worked_out": row.worked_out,
+                "workout_notes": row.workout_notes,
+                "notes": row.notes,
+                "health_issues": [],
+                "device_metrics": row.device_metrics,
+                "created_at": row.created_at,
+                "updated_at": row.updated_at,
+            }
+        if row.issue_type is not None:
+            current["health_issues"].append({
+                "issue_type": row.issue_type,
+                "severity": row.severity,
+                "notes": row.issue_notes,
+                "time_of_day": row.time_of_day,
+            })
+    if current is not None:
+        yield current
+
+
+def get_calendar_month(db: Session, year: int, month: int) -> dict:
+    """Columnar per-day summary of one month for the calendar view.
+
+    Reads only the columns the calendar renders; issue types are packed into
+    a bitmask where bit n is set when the nth issue type (in sort order, as
+    listed in issue_types) was logged. Bits are dense so masks stay small
+    however many issue types have been created over time.
+    """
+    first = date(year, month, 1)
+    last = period_end("month", first)
+    entry = models.DailyEntry
+
+    rows = db.execute(
+        select(entry.date, entry.stress_level, entry.worked_out)
+        .where(entry.date.between(first, last))
+        .order_by(entry.date)
+    ).all()
+
+    issue_bits = {t.name: bit for bit, t in enumerate(get_issue_types(db, active_only=False))}
+    masks: dict[date, int] = defaultdict(int)
+    counts: Counter[date] = Counter()
+    for day, issue_type in db.execute(
+        select(entry.date, models.HealthIssue.issue_type)
+        .join(models.HealthIssue, models.HealthIssue.daily_entry_id == entry.id)
+        .where(entry.date.between(first, last))
+    ):
+        counts[day] += 1
+        if issue_type in issue_bits:
+            masks[day] |= 1 << issue_bits[issue_type]
+
+    return {
+        "year": year,
+        "month": month,
+        "issue_types": {bit: name for name, bit in issue_bits.items()},
+        "dates": [row.date for row in rows],
+        "stress_level": [row.stress_level for row in rows],
+        "worked_out": [bool(row.worked_out) for row in rows],
+        "issue_mask": [masks[row.date] for row in rows],
+        "issue_count": [counts[row.date] for row in rows],
+    }
+
+
+def get_issue_types(db: Session, active_only: bool = True) -> list[schemas.IssueType]:
+    """Issue types, served from the query cache until create_issue_type invalidates it"""
+    key = ("issue_types", active_only)
+    cached = query_cache.get(key)
+    if cached is not MISSING:
+        return cached
+    generation = query_cache.generation(key)
+
     query = db.query(models.IssueType)
     if active_only:
         query = query.filter(models.IssueType.is_active == True)
-    return query.order_by(models.IssueType.sort_order).all()
+    issue_types = [
+        schemas.IssueType.model_validate(t) for t in query.order_by(models.IssueType.sort_order, models.IssueType.id)
+    ]
+    query_cache.set(key, issue_types, generation)
+    return issue_types
 
 
 def create_issue_type(db: Session, issue_type: schemas.IssueTypeCreate) -> models.IssueType:
     db_issue_type = models.IssueType(**issue_type.model_dump())
     db.add(db_issue_type)
     db.commit()
+    _data_changed("issue_types")
     db.refresh(db_issue_type)
     return db_issue_type
 
 
+def _stats_rollups_stmt(start_date: date) -> Select:
+    """Rollup rows tiling [start_date, today], plus any future-dated days"""
+    today = date.today()
+    return select(models.StatsRollup).where(or_(
+        buckets_filter(cover_range(start_date, today)),
+        and_(models.StatsRollup.period == "day", models.StatsRollup.period_start > today),
+    ))
+
+
 def get_stats(db: Session, days: int = 30) -> dict:
     start_date = date.today() - timedelta(days=days)
 
-    entries = db.query(models.DailyEntry).filter(
-        models.DailyEntry.date >= start_date
-    ).all()
+    rollups = db.scalars(_stats_rollups_stmt(start_date)).all()
+    streaks = get_streaks(db)
 
-    total_entries = len(entries)
-    workout_days = sum(1 for e in entries if e.worked_out)
-
-    stress_levels = [e.stress_level for e in entries if e.stress_level is not None]
-    avg_stress = sum(stress_levels) / len(stress_levels) if stress_levels else None
-
-    # Get common issues
-    issue_counts = db.query(
-        models.HealthIssue.issue_type,
-        func.count(models.HealthIssue.id).label("count")
-    ).join(models.DailyEntry).filter(
-        models.DailyEntry.date >= start_date
-    ).group_by(models.HealthIssue.issue_type).order_by(
-        desc("count")
-    ).limit(5).all()
-
-    common_issues = [{"type": issue_type, "count": count} for issue_type, count in issue_counts]
-
-    # Calculate streak
-    streak = 0
-    check_date = date.today()
-    while True:
-        entry = db.query(models.DailyEntry).filter(
-            models.DailyEntry.date == check_date
-        ).first()
-        if entry:
-            streak += 1
-            check_date -= timedelta(days=1)
-        else:
-            break
+    return _format_stats(rollups, streaks)
+
+
+def _format_stats(rollups: list[models.StatsRollup], streaks: tuple[int, int]) -> dict:
+    total_entries = sum(r.entry_count for r in rollups)
+    workout_days = sum(r.workout_count for r in rollups)
+    stress_count = sum(r.stress_count for r in rollups)
+    avg_stress = sum(r.stress_sum for r in rollups) / stress_count if stress_count else None
+    min_stress = min((r.stress_min for r in rollups if r.stress_min is not None), default=None)
+    max_stress = max((r.stress_max for r in rollups if r.stress_max is not None), default=None)
+
+    issue_counts = Counter()
+    for r in rollups:
+        issue_counts.update(r.issue_counts)
+
+    streak, longest_streak = streaks
+    common_issues = [{"type": issue_type, "count": count} for issue_type, count in issue_counts.most_common(5)]
 
     return {
         "total_entries": total_entries,
         "workout_days": workout_days,
-        "avg_stress": round(avg_stress, 1) if avg_stress else None,
+        "avg_stress": round(float(avg_stress), 1) if avg_stress else None,
+        "min_stress": min_stress,
+        "max_stress": max_stress,
         "common_issues": common_issues,
         "streak_days": streak,
+        "longest_streak_days": longest_streak,
     }
 
 
+def _day_number(dialect_name: str, column):
+    """Express a date column as a day count so consecutive dates differ by 1"""
+    if dialect_name == "sqlite":
+        return func.julianday(column)
+    return column - literal(date(1970, 1, 1), Date)
+
+
+def _streaks_stmt(dialect_name: str) -> Select:
+    """(current streak ending today, longest streak) in a single query.
+
+    Consecutive dates minus their row number are constant, so grouping on that
+    difference yields one row per run of days (gaps-and-islands). The current
+    streak counts only the days up to today, so entries logged ahead of time
+    don't push its end past today.
+    """
+    today = date.today()
+    entry_date = models.DailyEntry.date
+    runs = select(
+        entry_date,
+        (_day_number(dialect_name, entry_date) - func.row_number().over(order_by=entry_date)).label("island"),
+    ).subquery()
+
+    up_to_today = runs.c.date <= today
+    islands = select(
+        func.max(case((up_to_today, runs.c.date))).label("last_past_day"),
+        func.count(case((up_to_today, 1))).label("past_length"),
+        func.count().label("length"),
+    ).group_by(runs.c.island).subquery()
+
+    return select(
+        func.coalesce(func.max(case((islands.c.last_past_day == today, islands.c.past_length))), 0),
+        func.coalesce(func.max(islands.c.length), 0),
+    )
+
+
+def get_streaks(db: Session) -> tuple[int, int]:
+    """Return (current streak ending today, longest streak)"""
+    current, longest = db.execute(_streaks_stmt(db.get_bind().dialect.name)).one()
+    return current, longest
+
+
 def seed_default_issue_types(db: Session):
     """Seed default issue types if none exist"""
     existing = db.query(models.IssueType).first()
@@ -183,19 +591,63 @@ def seed_default_issue_types(db: Session):
         db.add(models.IssueType(**issue_type))
 
     db.commit()
+    _data_changed("issue_types")
 
 
 # Workout Routine CRUD Operations
 
+def _routine_with_days():
+    return selectinload(models.WorkoutRoutine.days).selectinload(models.WorkoutDay.exercises)
+
+
 def get_workout_routines(db: Session, active_only: bool = True) -> list[models.WorkoutRoutine]:
-    query = db.query(models.WorkoutRoutine)
+    query = db.query(models.WorkoutRoutine).options(_routine_with_days())
     if active_only:
         query = query.filter(models.WorkoutRoutine.is_active == True)
     return query.all()
 
 
+def get_workout_routine_rows(db: Session, active_only: bool = True) -> list[dict]:
+    """get_workout_routines as plain dicts, in the same three queries"""
+    routine, day, exercise = models.WorkoutRoutine, models.WorkoutDay, models.Exercise
+
+    stmt = select(
+        routine.name, routine.description, routine.id, routine.is_active, routine.created_at, routine.updated_at,
+    ).order_by(routine.id)
+    if active_only:
+        stmt = stmt.where(routine.is_active == True)
+    routines = {row.id: {**row._asdict(), "days": []} for row in db.execute(stmt)}
+    if not routines:
+        return []
+
+    days = {}
+    for row in db.execute(
+        select(day.name, day.day_of_week, day.sort_order, day.id, day.routine_id)
+        .where(day.routine_id.in_(routines)).order_by(day.id)
+    ):
+        days[row.id] = {**row._asdict(), "exercises": []}
+        routines[row.routine_id]["days"].append(days[row.id])
+
+    if days:
+        for row in db.execute(
+            select(
+                exercise.name, exercise.target_sets, exercise.target_reps, exercise.target_weight,
+                exercise.rest_seconds, exercise.notes, exercise.sort_order, exercise.id, exercise.workout_day_id,
+            ).where(exercise.workout_day_id.in_(days)).order_by(exercise.workout_day_id, exercise.id)
+        ):
+            days[row.workout_day_id]["exercises"].append(row._asdict())
+
+    # Key order follows schemas.WorkoutRoutine: days come before the timestamps
+    return [
+        {key: routine_row[key] for key in ("name", "description", "id", "is_active", "days", "created_at", "updated_at")}
+        for routine_row in routines.values()
+    ]
+
+
 def get_workout_routine(db: Session, routine_id: int) -> models.WorkoutRoutine | None:
-    return db.query(models.WorkoutRoutine).filter(models.WorkoutRoutine.id == routine_id).first()
+    return db.query(models.WorkoutRoutine).options(
+        _routine_with_days()
+    ).filter(models.WorkoutRoutine.id == routine_id).first()
 
 
 def create_workout_routine(db: Session, routine: schemas.WorkoutRoutineCreate) -> models.WorkoutRoutine:
@@ -230,6 +682,7 @@ def create_workout_routine(db: Session, routine: schemas.WorkoutRoutineCreate) -
             db.add(db_exercise)
 
     db.commit()
+    _data_changed("workouts")
     db.refresh(db_routine)
     return db_routine
 
@@ -248,6 +701,7 @@ def update_workout_routine(
         setattr(db_routine, field, value)
 
     db.commit()
+    _data_changed("workouts")
     db.refresh(db_routine)
     return db_routine
 
@@ -259,6 +713,7 @@ def delete_workout_routine(db: Session, routine_id: int) -> bool:
 
     db.delete(db_routine)
     db.commit()
+    _data_changed("workouts")
     return True
 
 
@@ -300,6 +755,7 @@ def create_workout_day(
         db.add(db_exercise)
 
     db.commit()
+    _data_changed("workouts")
     db.refresh(db_day)
     return db_day
 
@@ -318,6 +774,7 @@ def update_workout_day(
         setattr(db_day, field, value)
 
     db.commit()
+    _data_changed("workouts")
     db.refresh(db_day)
     return db_day
 
@@ -329,6 +786,7 @@ def delete_workout_day(db: Session, day_id: int) -> bool:
 
     db.delete(db_day)
     db.commit()
+    _data_changed("workouts")
     return True
 
 
@@ -359,6 +817,7 @@ def create_exercise(
     )
     db.add(db_exercise)
     db.commit()
+    _data_changed("workouts")
     db.refresh(db_exercise)
     return db_exercise
 
@@ -377,6 +836,7 @@ def update_exercise(
         setattr(db_exercise, field, value)
 
     db.commit()
+    _data_changed("workouts")
     db.refresh(db_exercise)
     return db_exercise
 
@@ -388,23 +848,103 @@ def delete_exercise(db: Session, exercise_id: int) -> bool:
 
     db.delete(db_exercise)
     db.commit()
+    _data_changed("workouts")
     return True
 
 
-def get_todays_workout(db: Session) -> models.WorkoutDay | None:
+def get_todays_workout(db: Session) -> schemas.WorkoutDay | None:
     """Get the workout day scheduled for today based on day_of_week"""
     today_dow = date.today().weekday()  # Monday=0, Sunday=6
 
+    # Cached (including "no workout") until a routine, day or exercise changes
+    key = ("workouts", "today", today_dow)
+    cached = query_cache.get(key)
+    if cached is not MISSING:
+        return cached
+    generation = query_cache.generation(key)
+
+    workout = None
     # Get the active routine
-    routine = db.query(models.WorkoutRoutine).filter(
-        models.WorkoutRoutine.is_active == True
-    ).first()
+    routine = db.scalars(_active_routine_stmt()).first()
+    if routine:
+        # Find the workout day for today
+        workout = db.scalars(_workout_day_stmt(routine.id, today_dow)).first()
 
-    if not routine:
-        return None
+    workout = schemas.WorkoutDay.model_validate(workout) if workout else None
+    query_cache.set(key, workout, generation)
+    return workout
+
+
+def _active_routine_stmt() -> Select:
+    return select(models.WorkoutRoutine).where(models.WorkoutRoutine.is_active == True).limit(1)
+
+
+def _workout_day_stmt(routine_id: int, day_of_week: int) -> Select:
+    return select(models.WorkoutDay).options(
+        selectinload(models.WorkoutDay.exercises)
+    ).where(
+        models.WorkoutDay.routine_id == routine_id,
+        models.WorkoutDay.day_of_week == day_of_week
+    ).limit(1)
+
+
+# Async variants of the hot read paths, used when settings.async_db is enabled.
+# They share statements with the sync functions above so results stay identical.
+
+async def get_daily_entry_async(db: AsyncSession, entry_date: date) -> models.DailyEntry | None:
+    return (await db.scalars(_daily_entry_stmt(entry_date))).first()
+
+
+async def get_daily_entries_async(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 30,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    before: date | None = None,
+) -> list[models.DailyEntry]:
+    return list(await db.scalars(_daily_entries_stmt(skip, limit, start_date, end_date, before)))
+
+
+async def get_daily_entry_rows_async(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 30,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    before: date | None = None,
+) -> list[dict]:
+    entries = (await db.execute(_entry_rows_stmt(skip, limit, start_date, end_date, before))).all()
+    if not entries:
+        return []
+    issues, summaries = _entry_children_stmts(entries)
+    return _assemble_entry_rows(entries, (await db.execute(issues)).all(), (await db.execute(summaries)).all())
+
+
+async def get_stats_async(db: AsyncSession, days: int = 30) -> dict:
+    start_date = date.today() - timedelta(days=days)
+
+    rollups = (await db.scalars(_stats_rollups_stmt(start_date))).all()
+    streaks = (await db.execute(_streaks_stmt(db.bind.dialect.name))).one()
+
+    return _format_stats(rollups, tuple(streaks))
+
+
+async def get_todays_workout_async(db: AsyncSession) -> schemas.WorkoutDay | None:
+    """Async counterpart of get_todays_workout, sharing its cache entries"""
+    today_dow = date.today().weekday()
+
+    key = ("workouts", "today", today_dow)
+    cached = query_cache.get(key)
+    if cached is not MISSING:
+        return cached
+    generation = query_cache.generation(key)
+
+    workout = None
+    routine = (await db.scalars(_active_routine_stmt())).first()
+    if routine:
+        workout = (await db.scalars(_workout_day_stmt(routine.id, today_dow))).first()
 
-    # Find the workout day for today
-    return db.query(models.WorkoutDay).filter(
-        models.WorkoutDay.routine_id == routine.id,
-        models.WorkoutDay.day_of_week == today_dow
-    ).first()
+    workout = schemas.WorkoutDay.model_validate(workout) if workout else None
+    query_cache.set(key, workout, generation)
+    return workout
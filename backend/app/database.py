@@ -1,18 +1,85 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 from .config import get_settings
 
 settings = get_settings()
 
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False}  # SQLite specific
-)
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune each SQLite connection from settings as it is opened"""
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA journal_mode={settings.sqlite_journal_mode}")
+        cursor.execute(f"PRAGMA synchronous={settings.sqlite_synchronous}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+        cursor.execute(f"PRAGMA cache_size={int(settings.sqlite_cache_size)}")
+        cursor.execute(f"PRAGMA temp_store={settings.sqlite_temp_store}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout)}")
+    finally:
+        cursor.close()
+
+
+def _engine_options(url: str) -> dict:
+    """Engine keyword arguments appropriate for the URL's dialect"""
+    if make_url(url).get_backend_name() == "sqlite":
+        return {"connect_args": {"check_same_thread": False}}
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_timeout": settings.db_pool_timeout,
+    }
+
+
+def _configure_engine(sync_engine):
+    if sync_engine.dialect.name == "sqlite":
+        event.listen(sync_engine, "connect", _set_sqlite_pragmas)
+
+
+def create_db_engine(url: str):
+    engine = create_engine(url, **_engine_options(url))
+    _configure_engine(engine)
+    return engine
+
+
+def _async_database_url(url: str) -> str:
+    """Swap the sync driver for its asyncio counterpart (aiosqlite / asyncpg)"""
+    parsed = make_url(url)
+    driver = "sqlite+aiosqlite" if parsed.get_backend_name() == "sqlite" else "postgresql+asyncpg"
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def create_async_db_engine(url: str):
+    async_url = _async_database_url(url)
+    async_engine = create_async_engine(async_url, **_engine_options(async_url))
+    _configure_engine(async_engine.sync_engine)
+    return async_engine
+
+
+engine = create_db_engine(settings.database_url)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+if settings.async_db:
+    async_engine = create_async_db_engine(settings.database_url)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+else:
+    async_engine = None
+    AsyncSessionLocal = None
+
+
+def dialect_insert(db: Session, table):
+    """Insert construct that supports ON CONFLICT for the bound dialect"""
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
+
 
 def get_db():
     db = SessionLocal()
@@ -20,3 +87,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,262 @@
+"""Buffered ingestion of high-frequency wearable samples.
+
+Samples are accepted into an in-process buffer and written in batches
+(upserted on metric + timestamp, so re-syncing a device is idempotent).
+Each flush also refreshes the per-day DeviceDailySummary rows it touched,
+which are what DailyEntry responses expose, and the DeviceHourlyRollup rows
+that back the bucketed /api/metrics queries.
+"""
+import asyncio
+import logging
+import threading
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Date, DateTime, delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from . import models
+from .cache import data_versions
+from .config import get_settings
+from .database import SessionLocal, dialect_insert
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+def to_utc_naive(timestamp: datetime) -> datetime:
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp
+
+
+class SampleBuffer:
+    """Thread-safe list of pending sample rows, with failed flush attempts per sample"""
+
+    def __init__(self):
+        self._rows: list[dict] = []
+        self._attempts: dict[tuple[str, datetime], int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def extend(self, rows: list[dict]) -> int:
+        with self._lock:
+            self._rows.extend(rows)
+            return len(self._rows)
+
+    def drain(self) -> list[dict]:
+        with self._lock:
+            rows, self._rows = self._rows, []
+            return rows
+
+    def requeue(self, rows: list[dict], max_attempts: int) -> int:
+        """Put back rows whose flush failed, ahead of newer ones; returns how many were dropped instead"""
+        with self._lock:
+            kept = []
+            for row in rows:
+                key = (row["metric"], row["timestamp"])
+                attempts = self._attempts.get(key, 0) + 1
+                if attempts >= max_attempts:
+                    self._attempts.pop(key, None)
+                else:
+                    self._attempts[key] = attempts
+                    kept.append(row)
+            self._rows[:0] = kept
+            return len(rows) - len(kept)
+
+    def written(self, rows: list[dict]):
+        """Forget the failed attempts of rows that have now been flushed"""
+        if self._attempts:
+            with self._lock:
+                for row in rows:
+                    self._attempts.pop((row["metric"], row["timestamp"]), None)
+
+
+sample_buffer = SampleBuffer()
+_flush_lock = asyncio.Lock()
+# First key of the two-key PostgreSQL advisory locks on a metric's rollups; the second hashes the metric
+METRIC_LOCK_KEY = 0x5255_0003
+
+
+def write_samples(db: Session, rows: list[dict]):
+    """Upsert samples with one executemany and refresh the affected day summaries"""
+    # Last reading wins when a batch repeats a (metric, timestamp) pair
+    rows = list({(row["metric"], row["timestamp"]): row for row in rows}.values())
+    if not rows:
+        return
+
+    table = models.DeviceSample.__table__
+    stmt = dialect_insert(db, table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.metric, table.c.timestamp],
+        set_={"value": stmt.excluded.value},
+    )
+    db.execute(stmt, rows)
+    refresh_daily_summaries(db, {(row["metric"], row["timestamp"].date()) for row in rows})
+    refresh_hourly_rollups(db, {
+        (row["metric"], row["timestamp"].replace(minute=0, second=0, microsecond=0)) for row in rows
+    })
+    db.commit()
+    data_versions.bump("devices")  # entry responses embed the day summaries
+
+
+def bucket_start(dialect_name: str, bucket: str, column):
+    """Truncate a timestamp column to the start of its hour/day/week (Monday)/month"""
+    if dialect_name == "postgresql":
+        return func.date_trunc(bucket, column, type_=DateTime)
+    formats = {
+        "hour": ("%Y-%m-%d %H:00:00",),
+        "day": ("%Y-%m-%d 00:00:00",),
+        "week": ("%Y-%m-%d 00:00:00", "-6 days", "weekday 1"),
+        "month": ("%Y-%m-01 00:00:00",),
+    }
+    fmt, *modifiers = formats[bucket]
+    return func.strftime(fmt, column, *modifiers, type_=DateTime)
+
+
+def _as_datetime(value: date | datetime) -> datetime:
+    return value if isinstance(value, datetime) else datetime.combine(value, datetime.min.time())
+
+
+def _lock_metrics(db: Session, metrics: Iterable[str]):
+    """Hold off other transactions refreshing these metrics' rollups until this one ends.
+
+    Without this, two PostgreSQL transactions flushing samples of the same
+    metric each recompute its buckets from a snapshot missing the other's
+    samples, and the second insert of a bucket fails on its unique key.
+    Taking the locks in a fixed order keeps concurrent flushes from
+    deadlocking. SQLite runs one write transaction at a time.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    for metric in sorted(metrics):
+        db.execute(select(func.pg_advisory_xact_lock(METRIC_LOCK_KEY, func.hashtext(metric))))
+
+
+def _refresh_rollup(db: Session, model, key_column: str, bucket, keys: set[tuple[str, date | datetime]], span: timedelta):
+    """Recompute a per-bucket sample rollup table over the range spanned by keys, per metric"""
+    sample = models.DeviceSample
+    starts_by_metric = defaultdict(list)
+    for metric, start in keys:
+        starts_by_metric[metric].append(start)
+    _lock_metrics(db, starts_by_metric)
+
+    for metric, starts in starts_by_metric.items():
+        low, high = min(starts), max(starts) + span
+        aggregates = db.execute(
+            select(
+                bucket.label(key_column),
+                sample.metric,
+                func.count().label("count"),
+                func.sum(sample.value).label("total"),
+                func.min(sample.value).label("min_value"),
+                func.max(sample.value).label("max_value"),
+            )
+            .where(
+                sample.metric == metric,
+                sample.timestamp >= _as_datetime(low),
+                sample.timestamp < _as_datetime(high),
+            )
+            .group_by(bucket, sample.metric)
+        ).all()
+
+        key = getattr(model, key_column)
+        db.execute(delete(model).where(model.metric == metric, key >= low, key < high))
+        if aggregates:
+            db.execute(insert(model.__table__), [row._asdict() for row in aggregates])
+
+
+def refresh_daily_summaries(db: Session, keys: set[tuple[str, date]]):
+    """Recompute DeviceDailySummary rows for the given (metric, day) pairs"""
+    day = func.date(models.DeviceSample.timestamp, type_=Date)
+    _refresh_rollup(db, models.DeviceDailySummary, "date", day, keys, timedelta(days=1))
+
+
+def refresh_hourly_rollups(db: Session, keys: set[tuple[str, datetime]]):
+    """Recompute DeviceHourlyRollup rows for the given (metric, hour) pairs"""
+    hour = bucket_start(db.get_bind().dialect.name, "hour", models.DeviceSample.timestamp)
+    _refresh_rollup(db, models.DeviceHourlyRollup, "hour", hour, keys, timedelta(hours=1))
+
+
+def get_metric_series(db: Session, metric: str, start: datetime, end: datetime, bucket: str) -> dict:
+    """Per-bucket count/min/max/avg for [start, end), summed from the hourly rollups.
+
+    The range is widened to whole hours, the rollup granularity.
+    """
+    rollup = models.DeviceHourlyRollup
+    start = to_utc_naive(start).replace(minute=0, second=0, microsecond=0)
+    end = to_utc_naive(end)
+    bucket_col = bucket_start(db.get_bind().dialect.name, bucket, rollup.hour)
+
+    rows = db.execute(
+        select(
+            bucket_col.label("bucket"),
+            func.sum(rollup.count).label("count"),
+            func.sum(rollup.total).label("total"),
+            func.min(rollup.min_value).label("min_value"),
+            func.max(rollup.max_value).label("max_value"),
+        )
+        .where(rollup.metric == metric, rollup.hour >= start, rollup.hour < end)
+        .group_by(bucket_col)
+        .order_by(bucket_col)
+    ).all()
+
+    return {
+        "metric": metric,
+        "bucket": bucket,
+        "start": start,
+        "end": end,
+        "timestamps": [row.bucket for row in rows],
+        "count": [row.count for row in rows],
+        "min": [row.min_value for row in rows],
+        "max": [row.max_value for row in rows],
+        "avg": [round(row.total / row.count, 3) for row in rows],
+    }
+
+
+def buffer_samples(samples) -> int:
+    """Queue validated samples; returns how many are now waiting"""
+    return sample_buffer.extend([
+        {"metric": s.metric, "timestamp": to_utc_naive(s.timestamp), "value": s.value}
+        for s in samples
+    ])
+
+
+def _flush_sync(rows: list[dict]):
+    db = SessionLocal()
+    try:
+        write_samples(db, rows)
+    finally:
+        db.close()
+
+
+async def flush_samples():
+    """Write everything currently buffered, one batch at a time"""
+    async with _flush_lock:
+        rows = sample_buffer.drain()
+        if not rows:
+            return
+        try:
+            await run_in_threadpool(_flush_sync, rows)
+        except Exception:
+            # Keep them for the next attempt, but don't let a batch that can never be written block the rest forever
+            dropped = sample_buffer.requeue(rows, settings.device_flush_max_attempts)
+            if dropped:
+                logger.error("Dropped %d device samples after %d failed flushes",
+                             dropped, settings.device_flush_max_attempts)
+            raise
+        sample_buffer.written(rows)
+
+
+async def run_periodic_flush():
+    """Background task started by main.lifespan"""
+    while True:
+        await asyncio.sleep(settings.device_flush_interval_seconds)
+        try:
+            await flush_samples()
+        except Exception:
+            logger.exception("Flushing device samples failed")
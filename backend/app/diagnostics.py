@@ -0,0 +1,182 @@
+"""Production diagnostics: a slow-query log and an on-demand request profiler.
+
+Both are off by default and configured from Settings:
+
+- slow_query_ms logs every statement slower than the threshold, with its
+  parameters, duration and the app function that issued it, plus its query
+  plan when slow_query_explain is set.
+- profiling_token lets a request sending ``X-Profile: <token>`` receive a
+  sampled CPU profile of itself instead of its normal body.
+"""
+import logging
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+PARAMETERS_MAX_CHARS = 500
+# Frames from these modules are plumbing, not the code that asked for the query
+_INFRASTRUCTURE_MODULES = {__name__, "app.database", "app.instrumentation"}
+
+
+def _caller() -> str:
+    """The innermost app function on the stack, e.g. app.crud.get_stats:409"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("app.") and module not in _INFRASTRUCTURE_MODULES:
+            return f"{module}.{frame.f_code.co_name}:{frame.f_lineno}"
+        frame = frame.f_back
+    return "unknown"
+
+
+class SlowQueryLog:
+    def __init__(self, threshold_ms: float, explain: bool = False):
+        self.threshold = threshold_ms / 1000
+        self.explain = explain
+
+    def install(self, engine: Engine):
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_started", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("slow_query_started")
+        if not started:
+            return
+        elapsed = time.perf_counter() - started.pop()
+        if elapsed < self.threshold:
+            return
+
+        plan = self._plan(conn, statement, parameters) if self.explain and not executemany else None
+        logger.warning(
+            "Slow query (%.1f ms) from %s: %s | parameters: %s%s",
+            elapsed * 1000,
+            _caller(),
+            " ".join(statement.split()),
+            repr(parameters)[:PARAMETERS_MAX_CHARS],
+            f" | plan: {plan}" if plan else "",
+        )
+
+    def _plan(self, conn, statement: str, parameters) -> str | None:
+        if not statement.lstrip().upper().startswith(("SELECT", "WITH")):
+            return None
+        prefix = "EXPLAIN QUERY PLAN " if conn.dialect.name == "sqlite" else "EXPLAIN "
+        # On the DBAPI cursor, so engine events (query counts, this log) never see it
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(prefix + statement, parameters)
+            rows = cursor.fetchall()
+        except Exception:
+            logger.debug("Could not explain slow query", exc_info=True)
+            return None
+        finally:
+            cursor.close()
+        # SQLite plans are (id, parent, notused, detail); other databases return one text column
+        return "; ".join(str(row[-1]) for row in rows)
+
+
+class _Sampler(threading.Thread):
+    """Samples every thread's stack until stopped, as folded stack counts"""
+
+    IDLE_FILES = ("threading.py", "queue.py", "selectors.py")
+
+    def __init__(self, interval: float):
+        super().__init__(name="request-profiler", daemon=True)
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        me = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            self.samples += 1
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == me or frame.f_code.co_filename.endswith(self.IDLE_FILES):
+                    continue  # skip ourselves and threads parked waiting for work
+                stack = []
+                while frame is not None:
+                    module = frame.f_globals.get("__name__", "?")
+                    stack.append(f"{module}.{frame.f_code.co_name}")
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class ProfilingMiddleware:
+    """Answers requests carrying the profiling token with their CPU profile.
+
+    The request runs normally but its body is replaced by the sampled stacks
+    in folded format (one "frame;frame;frame count" line per stack, readable
+    by flamegraph.pl or speedscope). Sampling covers every thread, so other
+    requests served at the same time show up too.
+    """
+
+    header = b"x-profile"
+
+    def __init__(self, app, token: str, interval: float = 0.001):
+        self.app = app
+        self.token = token.encode()
+        self.interval = interval
+
+    def _requested(self, scope) -> bool:
+        for name, value in scope.get("headers", []):
+            if name == self.header:
+                return secrets.compare_digest(value, self.token)
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._requested(scope):
+            return await self.app(scope, receive, send)
+
+        status = 500
+
+        async def discard_body(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        sampler = _Sampler(self.interval)
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, discard_body)
+        finally:
+            sampler.stop()
+        elapsed = time.perf_counter() - started
+
+        body = "".join(f"{stack} {count}\n" for stack, count in sampler.stacks.most_common()).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/plain; charset=utf-8"),
+                (b"content-length", str(len(body)).encode()),
+                (b"x-profile-status", str(status).encode()),
+                (b"x-profile-samples", str(sampler.samples).encode()),
+                (b"x-profile-duration-ms", f"{elapsed * 1000:.2f}".encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def install(app, settings, *engines: Engine):
+    """Enable whichever diagnostics the settings turn on"""
+    if settings.slow_query_ms > 0:
+        slow_log = SlowQueryLog(settings.slow_query_ms, settings.slow_query_explain)
+        for engine in engines:
+            slow_log.install(engine)
+    if settings.profiling_token:
+        app.add_middleware(ProfilingMiddleware, token=settings.profiling_token)
@@ -0,0 +1,210 @@
+"""Per-request timing and database instrumentation, exported for Prometheus.
+
+Nothing here is installed unless Settings.metrics_enabled is set, so a
+disabled deployment pays no per-request or per-query cost. When enabled:
+
+- an ASGI middleware times every request, adds a Server-Timing header and
+  records a latency histogram per route
+- engine events count statements and the time spent running them
+- session events time the wait for a pooled connection
+- FastAPI's response_model serialization is timed
+
+Per-request figures live in a RequestStats object held in a ContextVar; the
+threadpool copies the context, so sync routes update the same object.
+"""
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+import fastapi.routing
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+# Upper bounds in seconds, Prometheus' default latency buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class RequestStats:
+    db_queries: int = 0
+    db_seconds: float = 0.0
+    pool_wait_seconds: float = 0.0
+    serialize_seconds: float = 0.0
+
+
+_current: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus sense"""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.total = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+
+    def lines(self, name: str, labels: str) -> list[str]:
+        out, running = [], 0
+        for bound, count in zip([*self.buckets, "+Inf"], self.counts):
+            running += count
+            out.append(f'{name}_bucket{{{labels},le="{bound}"}} {running}')
+        out.append(f"{name}_sum{{{labels}}} {self.total:.6f}")
+        out.append(f"{name}_count{{{labels}}} {running}")
+        return out
+
+
+class RequestMetrics:
+    """Aggregates per (method, route, status); only touched from the event loop"""
+
+    def __init__(self):
+        self.latency: dict[tuple[str, str, str], Histogram] = defaultdict(Histogram)
+        self.totals: dict[tuple[str, str], RequestStats] = defaultdict(RequestStats)
+
+    def observe(self, method: str, route: str, status: int, seconds: float, stats: RequestStats):
+        self.latency[method, route, str(status)].observe(seconds)
+        totals = self.totals[method, route]
+        totals.db_queries += stats.db_queries
+        totals.db_seconds += stats.db_seconds
+        totals.pool_wait_seconds += stats.pool_wait_seconds
+        totals.serialize_seconds += stats.serialize_seconds
+
+    def render(self) -> str:
+        """Prometheus text exposition format"""
+        lines = [
+            "# HELP healthify_http_request_duration_seconds Time from request to last response byte.",
+            "# TYPE healthify_http_request_duration_seconds histogram",
+        ]
+        for (method, route, status), histogram in sorted(self.latency.items()):
+            labels = f'method="{method}",route="{route}",status="{status}"'
+            lines += histogram.lines("healthify_http_request_duration_seconds", labels)
+
+        counters = [
+            ("healthify_db_queries_total", "SQL statements executed.", "db_queries", "{}"),
+            ("healthify_db_query_seconds_total", "Time spent executing SQL statements.", "db_seconds", "{:.6f}"),
+            ("healthify_db_pool_wait_seconds_total", "Time spent waiting for a database connection.",
+             "pool_wait_seconds", "{:.6f}"),
+            ("healthify_serialization_seconds_total", "Time spent validating and encoding response models.",
+             "serialize_seconds", "{:.6f}"),
+        ]
+        for name, help_text, field, fmt in counters:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            for (method, route), totals in sorted(self.totals.items()):
+                value = fmt.format(getattr(totals, field))
+                lines.append(f'{name}{{method="{method}",route="{route}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics()
+
+
+def _server_timing(total: float, stats: RequestStats) -> bytes:
+    return (
+        f'app;dur={total * 1000:.2f}, '
+        f'db;dur={stats.db_seconds * 1000:.2f};desc="{stats.db_queries} queries", '
+        f'pool;dur={stats.pool_wait_seconds * 1000:.2f}, '
+        f'serialize;dur={stats.serialize_seconds * 1000:.2f}'
+    ).encode("latin-1")
+
+
+class MetricsMiddleware:
+    """Times each HTTP request and exposes the breakdown as Server-Timing"""
+
+    def __init__(self, app):
+        self.app = app
+        self._routes: dict | None = None
+
+    def _route_template(self, scope) -> str:
+        if self._routes is None:
+            # Built on first use, once every router has been included
+            self._routes = {
+                route.endpoint: route.path
+                for route in scope["app"].routes
+                if hasattr(route, "endpoint")
+            }
+        return self._routes.get(scope.get("endpoint"), "unmatched")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", _server_timing(time.perf_counter() - started, stats)))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            request_metrics.observe(
+                scope["method"], self._route_template(scope), status, time.perf_counter() - started, stats
+            )
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is not None and conn.info.get("query_started"):
+        stats.db_queries += 1
+        stats.db_seconds += time.perf_counter() - conn.info["query_started"].pop()
+
+
+def _before_orm_execute(orm_execute_state):
+    session = orm_execute_state.session
+    if _current.get() is not None and not session.in_transaction():
+        # The first statement of a transaction checks a connection out first
+        session.info["checkout_started"] = time.perf_counter()
+
+
+def _after_begin(session, transaction, connection):
+    stats = _current.get()
+    started = session.info.pop("checkout_started", None)
+    if stats is not None and started is not None:
+        stats.pool_wait_seconds += time.perf_counter() - started
+
+
+def _timed_serialize(serialize):
+    async def serialize_response(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await serialize(*args, **kwargs)
+        finally:
+            stats = _current.get()
+            if stats is not None:
+                stats.serialize_seconds += time.perf_counter() - started
+    serialize_response.__wrapped__ = serialize
+    return serialize_response
+
+
+def install(app, *engines: Engine):
+    """Wire the middleware and the engine, session and serialization hooks"""
+    app.add_middleware(MetricsMiddleware)
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(Session, "do_orm_execute", _before_orm_execute)
+    event.listen(Session, "after_begin", _after_begin)
+    # FastAPI has no hook around response_model serialization; its request
+    # handler looks serialize_response up on the module at call time.
+    if not hasattr(fastapi.routing.serialize_response, "__wrapped__"):
+        fastapi.routing.serialize_response = _timed_serialize(fastapi.routing.serialize_response)
@@ -1,27 +1,49 @@
+import asyncio
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse
 
 from .config import get_settings
-from .database import engine, SessionLocal
-from .models import Base
-from .routes import router
+from .database import async_engine, engine, SessionLocal
+from .routes import ConditionalGetMiddleware, router
 from .crud import seed_default_issue_types
+from .rollups import ensure_rollups
+from .devices import flush_samples, run_periodic_flush
+from .search import ensure_search_index
+from .migrations import run_migrations
+from . import diagnostics, instrumentation
+from .responses import require_orjson
+from .workers import enable_shared_versions, startup_once
 
 settings = get_settings()
+if settings.fast_json:
+    require_orjson()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: Create tables and seed data
-    Base.metadata.create_all(bind=engine)
-    db = SessionLocal()
-    try:
-        seed_default_issue_types(db)
-    finally:
-        db.close()
+    # Startup: Migrate the schema and seed data, once across all workers
+    with startup_once(settings.workers) as first:
+        if first:
+            run_migrations(engine)
+            ensure_search_index(engine)
+            db = SessionLocal()
+            try:
+                seed_default_issue_types(db)
+                ensure_rollups(db)
+            finally:
+                db.close()
+            if shared_versions is not None:
+                shared_versions.new_boot()
+    flusher = asyncio.create_task(run_periodic_flush())
     yield
-    # Shutdown: cleanup if needed
+    # Shutdown: stop the background flush and write any buffered device samples
+    flusher.cancel()
+    await flush_samples()
 
 
 app = FastAPI(
@@ -31,6 +53,14 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+
+@app.exception_handler(RequestValidationError)
+async def validation_exception_handler(request: Request, exc: RequestValidationError):
+    # Same body as FastAPI's handler, minus rejected NaN/Infinity inputs, which JSON cannot carry
+    errors = [{**error, "input": None} if error["type"] == "finite_number" else error for error in exc.errors()]
+    return JSONResponse(status_code=422, content={"detail": jsonable_encoder(errors)})
+
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -38,9 +68,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Server-Timing"],
 )
 
+app.add_middleware(ConditionalGetMiddleware)
+
+if settings.gzip_min_size > 0:
+    app.add_middleware(GZipMiddleware, minimum_size=settings.gzip_min_size)
+
+engines = [engine, *([async_engine.sync_engine] if async_engine is not None else [])]
+if settings.metrics_enabled:
+    instrumentation.install(app, *engines)
+diagnostics.install(app, settings, *engines)
+
+# Several worker processes keep their caches and ETags in step through the database
+shared_versions = enable_shared_versions(app, engine) if settings.workers > 1 else None
+
 # Include routes
+if settings.async_db:
+    from .async_routes import router as async_router
+    app.include_router(async_router)
 app.include_router(router)
 
 
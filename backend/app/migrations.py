@@ -0,0 +1,28 @@
+"""Apply the Alembic migrations in backend/migrations at startup.
+
+The schema used to be created with Base.metadata.create_all(); the baseline
+revision only creates tables that are missing, so databases from before
+migrations upgrade in place without being stamped by hand.
+"""
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy.engine import Engine
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def alembic_config() -> Config:
+    """Alembic config pointing at the backend's migration scripts"""
+    cfg = Config(str(BACKEND_DIR / "alembic.ini"))
+    cfg.set_main_option("script_location", str(BACKEND_DIR / "migrations"))
+    return cfg
+
+
+def run_migrations(engine: Engine, revision: str = "head"):
+    """Upgrade the database behind `engine` to `revision`"""
+    cfg = alembic_config()
+    with engine.begin() as connection:
+        cfg.attributes["connection"] = connection
+        command.upgrade(cfg, revision)
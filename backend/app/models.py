@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, Text, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, Float, Text, ForeignKey, Index, JSON, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .database import Base
@@ -24,18 +25,33 @@ class DailyEntry(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
-    health_issues = relationship("HealthIssue", back_populates="daily_entry", cascade="all, delete-orphan")
+    health_issues = relationship(
+        "HealthIssue",
+        back_populates="daily_entry",
+        cascade="all, delete-orphan",
+        order_by="(HealthIssue.daily_entry_id, HealthIssue.id)",  # the daily_entry_id index yields this order
+    )
 
     # Future extensibility: store arbitrary metrics from devices
-    device_metrics = Column(JSON, nullable=True)
+    device_metrics = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)
+
+    # Per-day rollups of wearable samples (see DeviceSample); matched on date, not a foreign key
+    device_summaries = relationship(
+        "DeviceDailySummary",
+        primaryjoin="DailyEntry.date == foreign(DeviceDailySummary.date)",
+        order_by="DeviceDailySummary.metric",
+        viewonly=True,
+    )
 
 
 class HealthIssue(Base):
     """Health issues/symptoms logged for a day"""
     __tablename__ = "health_issues"
+    # Covers per-type counts joined back to their entries without touching the table
+    __table_args__ = (Index("ix_health_issues_issue_type_daily_entry_id", "issue_type", "daily_entry_id"),)
 
     id = Column(Integer, primary_key=True, index=True)
-    daily_entry_id = Column(Integer, ForeignKey("daily_entries.id"), nullable=False)
+    daily_entry_id = Column(Integer, ForeignKey("daily_entries.id"), nullable=False, index=True)
 
     issue_type = Column(String(100), nullable=False)  # e.g., "heart_palpitations", "headache"
     severity = Column(Integer, nullable=True)  # 1-10 scale
@@ -47,6 +63,75 @@ class HealthIssue(Base):
     daily_entry = relationship("DailyEntry", back_populates="health_issues")
 
 
+class DeviceSample(Base):
+    """One wearable reading (heart rate, steps, HRV...) at a point in time"""
+    __tablename__ = "device_samples"
+    __table_args__ = (UniqueConstraint("metric", "timestamp"),)
+
+    id = Column(Integer, primary_key=True)
+    metric = Column(String(50), nullable=False)
+    timestamp = Column(DateTime, nullable=False)  # UTC
+    value = Column(Float, nullable=False)
+
+
+class DeviceDailySummary(Base):
+    """Per-day downsample of device_samples, refreshed whenever samples are flushed"""
+    __tablename__ = "device_daily_summaries"
+    __table_args__ = (UniqueConstraint("date", "metric"),)
+
+    id = Column(Integer, primary_key=True)
+    date = Column(Date, nullable=False, index=True)  # UTC day
+    metric = Column(String(50), nullable=False)
+    count = Column(Integer, nullable=False)
+    total = Column(Float, nullable=False)
+    min_value = Column(Float, nullable=False)
+    max_value = Column(Float, nullable=False)
+
+
+class DeviceHourlyRollup(Base):
+    """Per-hour downsample of device_samples; bucketed metric queries aggregate these"""
+    __tablename__ = "device_hourly_rollups"
+    __table_args__ = (UniqueConstraint("metric", "hour"),)
+
+    id = Column(Integer, primary_key=True)
+    metric = Column(String(50), nullable=False)
+    hour = Column(DateTime, nullable=False)  # UTC, truncated to the hour
+    count = Column(Integer, nullable=False)
+    total = Column(Float, nullable=False)
+    min_value = Column(Float, nullable=False)
+    max_value = Column(Float, nullable=False)
+
+
+class StatsRollup(Base):
+    """Precomputed entry aggregates for one day, ISO week or month.
+
+    Maintained by the crud entry mutators (see rollups.refresh_rollups) so
+    stats over long windows sum a handful of rows instead of rescanning.
+    """
+    __tablename__ = "stats_rollups"
+    __table_args__ = (UniqueConstraint("period", "period_start"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    period = Column(String(10), nullable=False)  # day, week, month
+    period_start = Column(Date, nullable=False)  # the day, the week's Monday or the 1st of the month
+
+    entry_count = Column(Integer, nullable=False, default=0)
+    workout_count = Column(Integer, nullable=False, default=0)
+    stress_sum = Column(Integer, nullable=False, default=0)
+    stress_count = Column(Integer, nullable=False, default=0)
+    stress_min = Column(Integer, nullable=True)
+    stress_max = Column(Integer, nullable=True)
+    issue_counts = Column(JSON, nullable=False, default=dict)  # issue_type -> number of HealthIssue rows
+
+
+class DataVersion(Base):
+    """Shared write counter per cache namespace, so worker processes see each other's writes"""
+    __tablename__ = "data_versions"
+
+    namespace = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
 class IssueType(Base):
     """Predefined issue types for quick selection"""
     __tablename__ = "issue_types"
@@ -70,12 +155,14 @@ class WorkoutRoutine(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
-    days = relationship("WorkoutDay", back_populates="routine", cascade="all, delete-orphan")
+    days = relationship("WorkoutDay", back_populates="routine", cascade="all, delete-orphan", order_by="WorkoutDay.id")
 
 
 class WorkoutDay(Base):
     """A day within a workout routine (e.g., Push Day, Pull Day)"""
     __tablename__ = "workout_days"
+    # Today's workout looks days up by routine and weekday
+    __table_args__ = (Index("ix_workout_days_routine_id_day_of_week", "routine_id", "day_of_week"),)
 
     id = Column(Integer, primary_key=True, index=True)
     routine_id = Column(Integer, ForeignKey("workout_routines.id"), nullable=False)
@@ -84,7 +171,12 @@ class WorkoutDay(Base):
     sort_order = Column(Integer, default=0)
 
     routine = relationship("WorkoutRoutine", back_populates="days")
-    exercises = relationship("Exercise", back_populates="workout_day", cascade="all, delete-orphan")
+    exercises = relationship(
+        "Exercise",
+        back_populates="workout_day",
+        cascade="all, delete-orphan",
+        order_by="(Exercise.workout_day_id, Exercise.id)",  # the workout_day_id index yields this order
+    )
 
 
 class Exercise(Base):
@@ -92,7 +184,7 @@ class Exercise(Base):
     __tablename__ = "exercises"
 
     id = Column(Integer, primary_key=True, index=True)
-    workout_day_id = Column(Integer, ForeignKey("workout_days.id"), nullable=False)
+    workout_day_id = Column(Integer, ForeignKey("workout_days.id"), nullable=False, index=True)
     name = Column(String(100), nullable=False)
     target_sets = Column(Integer, nullable=True)
     target_reps = Column(String(50), nullable=True)  # e.g., "8-12", "10", "5x5"
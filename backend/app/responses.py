@@ -0,0 +1,26 @@
+"""orjson responses for the list endpoints (Settings.fast_json).
+
+The list routes normally hand ORM objects to FastAPI, which validates them
+into the response_model (from_attributes) and then runs jsonable_encoder and
+json.dumps over the result. With fast_json on they instead return plain
+dicts read as column tuples (crud.get_daily_entry_rows and friends) in a
+FastJSONResponse, which orjson encodes in one pass. The output is the same
+JSON, so clients cannot tell the two paths apart.
+"""
+from fastapi.responses import ORJSONResponse
+
+try:
+    import orjson
+except ImportError:  # only needed when fast_json is on; see require_orjson()
+    orjson = None
+
+
+class FastJSONResponse(ORJSONResponse):
+    def render(self, content) -> bytes:
+        # UTC datetimes end in "Z" and dict keys need not be strings, as with pydantic
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+
+
+def require_orjson():
+    if orjson is None:
+        raise RuntimeError("FAST_JSON needs orjson; install it with `pip install .[fast]`")
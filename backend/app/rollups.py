@@ -0,0 +1,180 @@
+"""Maintenance of the stats_rollups table.
+
+Entry writes call refresh_rollups() for the dates they touched, which
+recomputes the affected day, ISO week and month rows from the source tables
+inside the caller's transaction. Concurrent writers touching the same buckets
+take turns (see _lock_buckets), so each recomputation sees the other's rows.
+Run ``python -m app.rollups`` to rebuild every row from scratch.
+"""
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from typing import Iterable
+
+from sqlalchemy import and_, delete, func, or_, select
+from sqlalchemy.orm import Session
+
+from . import models
+from .database import dialect_insert
+
+PERIODS = ("day", "week", "month")
+AGGREGATE_COLUMNS = (
+    "entry_count", "workout_count", "stress_sum", "stress_count", "stress_min", "stress_max", "issue_counts",
+)
+# First key of the two-key PostgreSQL advisory locks on rollup buckets; the second is the bucket's start day
+LOCK_KEYS = {"week": 0x5255_0001, "month": 0x5255_0002}
+
+
+def period_start(period: str, day: date) -> date:
+    if period == "day":
+        return day
+    if period == "week":
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+def period_end(period: str, start: date) -> date:
+    """Last day covered by the bucket beginning at start"""
+    if period == "day":
+        return start
+    if period == "week":
+        return start + timedelta(days=min(6, (date.max - start).days))  # the week of date.max ends with it
+    if start.month == 12:
+        return start.replace(day=31)  # also keeps December 9999 from overflowing into year 10000
+    next_month = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return next_month - timedelta(days=1)
+
+
+def cover_range(start: date, end: date) -> list[tuple[str, date]]:
+    """Fewest (period, period_start) buckets that exactly tile [start, end]"""
+    buckets = []
+    day = start
+    while day <= end:
+        for period in ("month", "week", "day"):
+            if period_start(period, day) == day and period_end(period, day) <= end:
+                buckets.append((period, day))
+                day = period_end(period, day) + timedelta(days=1)
+                break
+    return buckets
+
+
+def buckets_filter(buckets: Iterable[tuple[str, date]]):
+    """WHERE clause matching the given (period, period_start) rows"""
+    starts = defaultdict(list)
+    for period, start in buckets:
+        starts[period].append(start)
+    return or_(*(
+        and_(models.StatsRollup.period == period, models.StatsRollup.period_start.in_(days))
+        for period, days in starts.items()
+    ))
+
+
+def _lock_buckets(db: Session, buckets: set[tuple[str, date]]):
+    """Hold off other transactions refreshing these buckets until this one ends.
+
+    Without this, two PostgreSQL transactions writing entries in the same
+    week each recompute it from a snapshot missing the other's entry. Week
+    and month locks cover their day buckets too; taking them in a fixed
+    order keeps concurrent refreshes from deadlocking. SQLite needs none of
+    this, as it runs one write transaction at a time.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    keys = sorted((LOCK_KEYS[period], start.toordinal()) for period, start in buckets if period in LOCK_KEYS)
+    for key, start in keys:
+        db.execute(select(func.pg_advisory_xact_lock(key, start)))
+
+
+def refresh_rollups(db: Session, dates: Iterable[date]):
+    """Recompute every rollup row covering any of the given entry dates.
+
+    Callers must flush pending ORM changes first; the caller commits.
+    """
+    buckets = {(period, period_start(period, day)) for day in dates for period in PERIODS}
+    if not buckets:
+        return
+    _lock_buckets(db, buckets)
+
+    low = min(start for _, start in buckets)
+    high = max(period_end(period, start) for period, start in buckets)
+
+    aggregates: dict[tuple[str, date], dict] = {}
+
+    def bucket_rows(day: date):
+        for period in PERIODS:
+            key = (period, period_start(period, day))
+            if key in buckets:
+                yield aggregates.setdefault(key, {
+                    "period": key[0],
+                    "period_start": key[1],
+                    "entry_count": 0,
+                    "workout_count": 0,
+                    "stress_sum": 0,
+                    "stress_count": 0,
+                    "stress_min": None,
+                    "stress_max": None,
+                    "issue_counts": Counter(),
+                })
+
+    entry = models.DailyEntry
+    for day, worked_out, stress in db.execute(
+        select(entry.date, entry.worked_out, entry.stress_level).where(entry.date.between(low, high))
+    ):
+        for row in bucket_rows(day):
+            row["entry_count"] += 1
+            row["workout_count"] += 1 if worked_out else 0
+            if stress is not None:
+                row["stress_sum"] += stress
+                row["stress_count"] += 1
+                row["stress_min"] = stress if row["stress_min"] is None else min(row["stress_min"], stress)
+                row["stress_max"] = stress if row["stress_max"] is None else max(row["stress_max"], stress)
+
+    for day, issue_type in db.execute(
+        select(entry.date, models.HealthIssue.issue_type)
+        .join(models.HealthIssue, models.HealthIssue.daily_entry_id == entry.id)
+        .where(entry.date.between(low, high))
+    ):
+        for row in bucket_rows(day):
+            row["issue_counts"][issue_type] += 1
+
+    emptied = buckets - aggregates.keys()
+    if emptied:
+        db.execute(delete(models.StatsRollup).where(buckets_filter(emptied)))
+    if aggregates:
+        table = models.StatsRollup.__table__
+        stmt = dialect_insert(db, table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.period, table.c.period_start],
+            set_={column: stmt.excluded[column] for column in AGGREGATE_COLUMNS},
+        )
+        rows = [{**row, "issue_counts": dict(row["issue_counts"])} for row in aggregates.values()]
+        db.execute(stmt, rows)
+
+
+def rebuild_rollups(db: Session, chunk_days: int = 366):
+    """Drop and recompute every rollup row from daily_entries/health_issues"""
+    db.execute(delete(models.StatsRollup))
+    dates = list(db.scalars(select(models.DailyEntry.date).order_by(models.DailyEntry.date)))
+    for i in range(0, len(dates), chunk_days):
+        refresh_rollups(db, dates[i:i + chunk_days])
+    db.commit()
+
+
+def ensure_rollups(db: Session):
+    """Build rollups on first start against a database that predates them"""
+    has_entries = db.scalar(select(models.DailyEntry.id).limit(1)) is not None
+    has_rollups = db.scalar(select(models.StatsRollup.id).limit(1)) is not None
+    if has_entries and not has_rollups:
+        rebuild_rollups(db)
+
+
+if __name__ == "__main__":
+    from .database import SessionLocal, engine
+    from .migrations import run_migrations
+
+    run_migrations(engine)
+    session = SessionLocal()
+    try:
+        rebuild_rollups(session)
+        print(f"Rebuilt {session.query(models.StatsRollup).count()} rollup rows")
+    finally:
+        session.close()
@@ -1,33 +1,217 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
-from datetime import date
+from datetime import date, datetime, timedelta, timezone
 from typing import Optional
+import csv
+import hashlib
+import io
+import json
 
-from . import crud, schemas
-from .database import get_db
+from . import analytics, crud, devices, schemas, search
+from .cache import data_versions, query_cache
+from .config import get_settings
+from .database import SessionLocal, get_db
+from .instrumentation import request_metrics
+from .responses import FastJSONResponse
+
+settings = get_settings()
 
 router = APIRouter(prefix="/api")
 
 
+def _etag_inputs(request: Request, namespaces: tuple[str, ...]) -> list[str]:
+    return [
+        data_versions.boot_id,
+        str(data_versions.get(*namespaces)),
+        date.today().isoformat(),
+        f"{request.url.path}?{request.url.query}",
+    ]
+
+
+def _conditional_get(*namespaces: str):
+    """Dependency giving a read endpoint an ETag and If-None-Match -> 304.
+
+    The tag covers the write counters for the namespaces the endpoint reads,
+    the request URL and today's date (stats and /today depend on it), so an
+    unchanged resource is answered before any query runs. With gzip on, the
+    tag is weak: the compressed and identity bodies share it.
+
+    The counters are read before the handler, so its queries see at least
+    that state; ConditionalGetMiddleware drops the tag if a write lands
+    before the body is sent, as the body may then be newer than the tag.
+    """
+    def check(request: Request, response: Response):
+        inputs = _etag_inputs(request, namespaces)
+        etag = f'"{hashlib.sha1(":".join(inputs).encode()).hexdigest()[:20]}"'
+        headers = {"ETag": f"W/{etag}" if settings.gzip_min_size > 0 else etag, "Cache-Control": "no-cache"}
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            if etag in candidates or "*" in candidates:
+                raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+        request.state.etag_inputs = (namespaces, inputs)
+
+    return Depends(check)
+
+
+class ConditionalGetMiddleware:
+    """Removes the ETag from responses whose data changed while they were built"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        async def send_checked(message):
+            if message["type"] == "http.response.start":
+                tagged = scope.get("state", {}).get("etag_inputs")
+                if tagged is not None and _etag_inputs(Request(scope), tagged[0]) != tagged[1]:
+                    headers = [(k, v) for k, v in message.get("headers", []) if k.lower() != b"etag"]
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_checked)
+
+
 @router.get("/health")
 def health_check():
     """Health check endpoint for Docker"""
     return {"status": "healthy"}
 
 
-@router.get("/entries", response_model=list[schemas.DailyEntry])
+@router.get("/entries", response_model=list[schemas.DailyEntry], dependencies=[_conditional_get("entries", "devices")])
 def list_entries(
+    response: Response,
     skip: int = 0,
     limit: int = Query(30, le=100),
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
+    before: Optional[date] = None,
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """Get daily entries with optional date filtering"""
-    return crud.get_daily_entries(db, skip=skip, limit=limit, start_date=start_date, end_date=end_date)
+    """Get daily entries with optional date filtering.
+
+    Pass `before` or the `X-Next-Cursor` header value from the previous page
+    as `cursor` to page through history without an offset scan.
+    """
+    read = crud.get_daily_entry_rows if settings.fast_json else crud.get_daily_entries
+    entries = read(
+        db,
+        skip=skip,
+        limit=limit,
+        start_date=start_date,
+        end_date=end_date,
+        before=_before_from_cursor(cursor, before),
+    )
+    _set_next_cursor(response, entries, limit)
+    return _fast_json(entries, response) if settings.fast_json else entries
+
+
+def _before_from_cursor(cursor: Optional[str], before: Optional[date]) -> Optional[date]:
+    if not cursor:
+        return before
+    try:
+        return crud.decode_entry_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _set_next_cursor(response: Response, entries: list, limit: int):
+    if entries and len(entries) == limit:
+        last = entries[-1]
+        response.headers["X-Next-Cursor"] = crud.encode_entry_cursor(last["date"] if isinstance(last, dict) else last.date)
+
+
+def _fast_json(rows: list[dict], response: Response) -> FastJSONResponse:
+    """Rows already shaped like the response_model, encoded without validating them again"""
+    return FastJSONResponse(rows, headers=dict(response.headers))
+
+
+BULK_IMPORT_CHUNK_SIZE = 500
+
+
+async def _iter_bulk_rows(request: Request):
+    """Yield (row, parsed object or error message) from a JSON array or NDJSON body"""
+    if request.headers.get("content-type", "").startswith(("application/x-ndjson", "application/jsonl")):
+        row = 0
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    row += 1
+                    yield row, _parse_json_line(line)
+        if buffer.strip():
+            yield row + 1, _parse_json_line(buffer)
+        return
+
+    try:
+        rows = json.loads(await request.body())
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+    if not isinstance(rows, list):
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+    for row, obj in enumerate(rows, start=1):
+        yield row, obj
+
+
+def _parse_json_line(line: bytes):
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return ValueError(f"Invalid JSON: {e}")
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'entry'}: {err['msg']}"
+        for err in error.errors(include_url=False)
+    )
+
+
+@router.post("/entries/bulk", response_model=schemas.BulkImportResult)
+async def bulk_import_entries(request: Request, db: Session = Depends(get_db)):
+    """Create or replace many entries from a JSON array or an NDJSON stream.
+
+    Valid rows are upserted on date in chunked transactions; invalid rows are
+    skipped and reported individually.
+    """
+    result = schemas.BulkImportResult(created=0, updated=0)
+    batch: list[schemas.DailyEntryCreate] = []
+
+    async def flush():
+        created, updated = await run_in_threadpool(crud.bulk_upsert_daily_entries, db, batch)
+        result.created += created
+        result.updated += updated
+        batch.clear()
+
+    async for row, obj in _iter_bulk_rows(request):
+        if isinstance(obj, ValueError):
+            result.errors.append(schemas.BulkImportError(row=row, detail=str(obj)))
+            continue
+        try:
+            batch.append(schemas.DailyEntryCreate.model_validate(obj))
+        except ValidationError as e:
+            result.errors.append(schemas.BulkImportError(row=row, detail=_format_validation_error(e)))
+            continue
+        if len(batch) >= BULK_IMPORT_CHUNK_SIZE:
+            await flush()
+
+    if batch:
+        await flush()
+    return result
 
 
-@router.get("/entries/{entry_date}", response_model=schemas.DailyEntry)
+@router.get("/entries/{entry_date}", response_model=schemas.DailyEntry, dependencies=[_conditional_get("entries", "devices")])
 def get_entry(entry_date: date, db: Session = Depends(get_db)):
     """Get a specific daily entry by date"""
     entry = crud.get_daily_entry(db, entry_date)
@@ -58,6 +242,19 @@ def update_entry(
     return entry
 
 
+@router.patch("/entries/{entry_date}/issues", response_model=schemas.DailyEntry)
+def toggle_entry_issue(
+    entry_date: date,
+    toggle: schemas.HealthIssueToggle,
+    db: Session = Depends(get_db)
+):
+    """Add, update or remove a single health issue on an entry"""
+    entry = crud.toggle_health_issue(db, entry_date, toggle)
+    if not entry:
+        raise HTTPException(status_code=404, detail="Entry not found")
+    return entry
+
+
 @router.delete("/entries/{entry_date}", status_code=204)
 def delete_entry(entry_date: date, db: Session = Depends(get_db)):
     """Delete a daily entry"""
@@ -67,7 +264,71 @@ def delete_entry(entry_date: date, db: Session = Depends(get_db)):
     return None
 
 
-@router.get("/issue-types", response_model=list[schemas.IssueType])
+EXPORT_CSV_COLUMNS = ["date", "stress_level", "worked_out", "workout_notes", "notes", "health_issues"]
+EXPORT_FLUSH_ROWS = 200
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _export_ndjson():
+    db = SessionLocal()
+    try:
+        lines = []
+        for entry in crud.iter_entries_with_issues(db):
+            lines.append(json.dumps(entry, default=_json_default))
+            if len(lines) >= EXPORT_FLUSH_ROWS:
+                yield "\n".join(lines) + "\n"
+                lines.clear()
+        if lines:
+            yield "\n".join(lines) + "\n"
+    finally:
+        db.close()
+
+
+def _export_csv():
+    db = SessionLocal()
+    try:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_CSV_COLUMNS)
+        for i, entry in enumerate(crud.iter_entries_with_issues(db), start=1):
+            writer.writerow([
+                entry["date"].isoformat(),
+                entry["stress_level"],
+                entry["worked_out"],
+                entry["workout_notes"],
+                entry["notes"],
+                ";".join(issue["issue_type"] for issue in entry["health_issues"]),
+            ])
+            if i % EXPORT_FLUSH_ROWS == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+    finally:
+        db.close()
+
+
+@router.get("/export/entries")
+def export_entries(format: str = Query("ndjson", pattern="^(ndjson|csv)$")):
+    """Stream every entry with its health issues as NDJSON or CSV"""
+    # The generator owns its session so it outlives the request dependency scope
+    if format == "csv":
+        body, media_type = _export_csv(), "text/csv"
+    else:
+        body, media_type = _export_ndjson(), "application/x-ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="healthify-entries.{format}"'},
+    )
+
+
+@router.get("/issue-types", response_model=list[schemas.IssueType], dependencies=[_conditional_get("issue_types")])
 def list_issue_types(
     active_only: bool = True,
     db: Session = Depends(get_db)
@@ -85,7 +346,7 @@ def create_issue_type(
     return crud.create_issue_type(db, issue_type)
 
 
-@router.get("/stats", response_model=schemas.StatsResponse)
+@router.get("/stats", response_model=schemas.StatsResponse, dependencies=[_conditional_get("entries")])
 def get_stats(
     days: int = Query(30, ge=1, le=365),
     db: Session = Depends(get_db)
@@ -94,30 +355,149 @@ def get_stats(
     return crud.get_stats(db, days=days)
 
 
-@router.get("/today", response_model=Optional[schemas.DailyEntry])
+@router.get(
+    "/calendar/{year}/{month}",
+    response_model=schemas.CalendarMonth,
+    dependencies=[_conditional_get("entries", "issue_types")],
+)
+def get_calendar_month(
+    year: int = Path(ge=1, le=9999),
+    month: int = Path(ge=1, le=12),
+    db: Session = Depends(get_db)
+):
+    """Compact columnar month view for the calendar"""
+    return crud.get_calendar_month(db, year, month)
+
+
+MAX_TREND_DAYS = 20 * 366
+# The rolling windows read this many days before start_date
+EARLIEST_TREND_DATE = date.min + timedelta(days=max(analytics.TREND_WINDOWS) - 1)
+
+
+@router.get(
+    "/analytics/trends",
+    response_model=schemas.TrendsResponse,
+    dependencies=[_conditional_get("entries")],
+)
+def get_trends(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: Session = Depends(get_db)
+):
+    """Rolling 7/30-day stress, workout frequency and issue incidence (default: last 90 days)"""
+    end_date = end_date or date.today()
+    if end_date < EARLIEST_TREND_DATE:
+        raise HTTPException(status_code=400, detail=f"end_date must be on or after {EARLIEST_TREND_DATE}")
+    start_date = start_date or end_date - timedelta(days=min(89, (end_date - EARLIEST_TREND_DATE).days))
+    if start_date < EARLIEST_TREND_DATE:
+        raise HTTPException(status_code=400, detail=f"start_date must be on or after {EARLIEST_TREND_DATE}")
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must not be after end_date")
+    if (end_date - start_date).days >= MAX_TREND_DAYS:
+        raise HTTPException(status_code=400, detail="Range is limited to 20 years")
+    return analytics.get_trends(db, start_date, end_date)
+
+
+@router.get(
+    "/analytics/correlations",
+    response_model=schemas.CorrelationReport,
+    dependencies=[_conditional_get("entries")],
+)
+def get_correlations(
+    high_stress: int = Query(7, ge=2, le=10),
+    max_lag: int = Query(3, ge=0, le=14),
+    db: Session = Depends(get_db)
+):
+    """How issue rates vary with stress and workouts, including lagged correlations"""
+    return analytics.get_correlation_report(db, high_stress=high_stress, max_lag=max_lag)
+
+
+@router.get("/search", response_model=schemas.SearchResults, dependencies=[_conditional_get("entries")])
+def search_notes(
+    q: str = Query(..., min_length=1, max_length=200),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Full-text search across entry, workout and symptom notes"""
+    if not search.is_supported(db.get_bind()):
+        raise HTTPException(status_code=501, detail="Search requires the SQLite backend")
+    return search.search_notes(db, q, skip=skip, limit=limit)
+
+
+@router.get("/today", response_model=Optional[schemas.DailyEntry], dependencies=[_conditional_get("entries", "devices")])
 def get_today(db: Session = Depends(get_db)):
     """Get today's entry or null if not created"""
     return crud.get_daily_entry(db, date.today())
 
 
+@router.get("/cache/stats", response_model=schemas.CacheStats)
+def get_cache_stats():
+    """Hit/miss counters for the in-process query cache"""
+    return query_cache.stats()
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def get_request_metrics():
+    """Request latency histograms and per-route DB counters in Prometheus text format"""
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(request_metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@router.post("/devices/samples", response_model=schemas.DeviceIngestResult, status_code=202)
+async def ingest_device_samples(batch: schemas.DeviceSampleBatch, flush: bool = False):
+    """Queue a batch of wearable samples; they are written by the periodic flush.
+
+    Pass `flush=true` to write the buffer before responding.
+    """
+    if len(devices.sample_buffer) + len(batch.samples) > settings.device_buffer_limit:
+        raise HTTPException(status_code=503, detail="Too many samples waiting to be written; retry later",
+                            headers={"Retry-After": str(max(1, round(settings.device_flush_interval_seconds)))})
+    buffered = devices.buffer_samples(batch.samples)
+    if flush or buffered >= settings.device_buffer_max_samples:
+        await devices.flush_samples()
+    return {"accepted": len(batch.samples), "buffered": len(devices.sample_buffer)}
+
+
+@router.get("/metrics/{name}", response_model=schemas.MetricSeries, dependencies=[_conditional_get("devices")])
+def get_metric_series(
+    name: str = Path(max_length=50, pattern=r"^[a-z0-9_.]+$"),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    bucket: str = Query("day", pattern="^(hour|day|week|month)$"),
+    db: Session = Depends(get_db)
+):
+    """Min/max/avg/count of a device metric per time bucket (default: last 7 days)"""
+    # Naive values are taken as UTC, like sample timestamps
+    end = devices.to_utc_naive(end or datetime.now(timezone.utc))
+    start = devices.to_utc_naive(start) if start else end - timedelta(days=7)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    return devices.get_metric_series(db, name, start, end, bucket)
+
+
 # Workout Routine Endpoints
 
-@router.get("/workouts", response_model=list[schemas.WorkoutRoutine])
+@router.get("/workouts", response_model=list[schemas.WorkoutRoutine], dependencies=[_conditional_get("workouts")])
 def list_workout_routines(
+    response: Response,
     active_only: bool = True,
     db: Session = Depends(get_db)
 ):
     """Get all workout routines"""
+    if settings.fast_json:
+        return _fast_json(crud.get_workout_routine_rows(db, active_only=active_only), response)
     return crud.get_workout_routines(db, active_only=active_only)
 
 
-@router.get("/workouts/today", response_model=Optional[schemas.WorkoutDay])
+@router.get("/workouts/today", response_model=Optional[schemas.WorkoutDay], dependencies=[_conditional_get("workouts")])
 def get_todays_workout(db: Session = Depends(get_db)):
     """Get today's scheduled workout based on day of week"""
     return crud.get_todays_workout(db)
 
 
-@router.get("/workouts/{routine_id}", response_model=schemas.WorkoutRoutine)
+@router.get("/workouts/{routine_id}", response_model=schemas.WorkoutRoutine, dependencies=[_conditional_get("workouts")])
 def get_workout_routine(routine_id: int, db: Session = Depends(get_db)):
     """Get a specific workout routine"""
     routine = crud.get_workout_routine(db, routine_id)
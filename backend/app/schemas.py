@@ -14,6 +14,11 @@ class HealthIssueCreate(HealthIssueBase):
     pass
 
 
+class HealthIssueToggle(HealthIssueBase):
+    """One issue switched on or off, matched by issue_type and time_of_day"""
+    selected: bool = True
+
+
 class HealthIssue(HealthIssueBase):
     id: int
     daily_entry_id: int
@@ -43,9 +48,21 @@ class DailyEntryUpdate(BaseModel):
     health_issues: Optional[list[HealthIssueCreate]] = None
 
 
+class DeviceDailySummary(BaseModel):
+    metric: str
+    count: int
+    total: float
+    min_value: float
+    max_value: float
+
+    class Config:
+        from_attributes = True
+
+
 class DailyEntry(DailyEntryBase):
     id: int
     health_issues: list[HealthIssue] = []
+    device_summaries: list[DeviceDailySummary] = []
     device_metrics: Optional[dict] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
@@ -54,6 +71,59 @@ class DailyEntry(DailyEntryBase):
         from_attributes = True
 
 
+class BulkImportError(BaseModel):
+    row: int  # 1-based position in the submitted array or NDJSON stream
+    detail: str
+
+
+class BulkImportResult(BaseModel):
+    created: int
+    updated: int
+    errors: list[BulkImportError] = []
+
+
+class DeviceSample(BaseModel):
+    metric: str = Field(..., max_length=50, pattern=r"^[a-z0-9_.]+$")  # e.g. heart_rate, steps, hrv
+    timestamp: datetime
+    value: float = Field(..., allow_inf_nan=False)  # NaN would be stored as NULL and fail the flush
+
+
+class DeviceSampleBatch(BaseModel):
+    samples: list[DeviceSample] = Field(..., max_length=20000)
+
+
+class DeviceIngestResult(BaseModel):
+    accepted: int
+    buffered: int  # samples waiting for the next flush
+
+
+class MetricSeries(BaseModel):
+    """Bucketed device metric as parallel arrays, one element per non-empty bucket"""
+    metric: str
+    bucket: str
+    start: datetime
+    end: datetime
+    timestamps: list[datetime]  # bucket start, UTC
+    count: list[int]
+    min: list[float]
+    max: list[float]
+    avg: list[float]
+
+
+class SearchHit(BaseModel):
+    kind: str  # notes, workout_notes or issue
+    entry_id: int
+    date: date
+    snippet: str  # HTML-escaped excerpt with matches wrapped in <mark>
+    rank: float  # bm25, lower is better
+
+
+class SearchResults(BaseModel):
+    query: str
+    total: int
+    hits: list[SearchHit]
+
+
 class IssueTypeBase(BaseModel):
     name: str
     display_name: str
@@ -73,12 +143,66 @@ class IssueType(IssueTypeBase):
         from_attributes = True
 
 
+class CalendarMonth(BaseModel):
+    """One month of calendar data as parallel arrays, one element per logged day"""
+    year: int
+    month: int
+    issue_types: dict[int, str]  # bit position in issue_mask -> IssueType.name
+    dates: list[date]
+    stress_level: list[Optional[int]]
+    worked_out: list[bool]
+    issue_mask: list[int]
+    issue_count: list[int]
+
+
+class TrendsResponse(BaseModel):
+    """Daily rolling series over [start_date, end_date], one element per calendar day"""
+    start_date: date
+    end_date: date
+    dates: list[date]
+    stress_mean_7d: list[Optional[float]]
+    stress_mean_30d: list[Optional[float]]
+    workout_rate_7d: list[Optional[float]]
+    workout_rate_30d: list[Optional[float]]
+    issue_incidence: dict[str, list[Optional[float]]]  # 30-day share of logged days with the issue
+
+
+class IssueCorrelation(BaseModel):
+    issue_type: str
+    days_with_issue: int
+    base_rate: Optional[float]
+    rate_high_stress: Optional[float]
+    rate_low_stress: Optional[float]
+    rate_workout: Optional[float]
+    rate_no_workout: Optional[float]
+    stress_correlation: list[Optional[float]]  # index = lag in days (stress before the issue)
+    workout_correlation: list[Optional[float]]
+
+
+class CorrelationReport(BaseModel):
+    days_analyzed: int
+    high_stress_threshold: int
+    max_lag: int
+    issues: list[IssueCorrelation]
+
+
 class StatsResponse(BaseModel):
     total_entries: int
     workout_days: int
     avg_stress: Optional[float]
+    min_stress: Optional[int] = None
+    max_stress: Optional[int] = None
     common_issues: list[dict]
     streak_days: int
+    longest_streak_days: int
+
+
+class CacheStats(BaseModel):
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+    evictions: int
 
 
 # Workout Routine Schemas
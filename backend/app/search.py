@@ -0,0 +1,151 @@
+"""Full-text search over entry notes, workout notes and symptom notes.
+
+Backed by an SQLite FTS5 table kept in sync by triggers, so ORM writes, the
+bulk importer's Core statements and cascade deletes are all indexed alike.
+Each indexed text gets a deterministic rowid (source id * 4 + kind code),
+which lets the triggers replace a row without scanning the index.
+"""
+import html
+import re
+
+from sqlalchemy import Engine, text
+from sqlalchemy.orm import Session
+
+KINDS = {"notes": 0, "workout_notes": 1, "issue": 2}
+
+_HIGHLIGHT_START = "\x02"
+_HIGHLIGHT_END = "\x03"
+
+_SCHEMA = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+        body, kind UNINDEXED, entry_id UNINDEXED, tokenize = 'porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS daily_entries_fts_insert AFTER INSERT ON daily_entries BEGIN
+        INSERT INTO notes_fts (rowid, body, kind, entry_id)
+            SELECT new.id * 4, new.notes, 'notes', new.id WHERE new.notes IS NOT NULL;
+        INSERT INTO notes_fts (rowid, body, kind, entry_id)
+            SELECT new.id * 4 + 1, new.workout_notes, 'workout_notes', new.id WHERE new.workout_notes IS NOT NULL;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS daily_entries_fts_update AFTER UPDATE OF notes, workout_notes ON daily_entries BEGIN
+        DELETE FROM notes_fts WHERE rowid IN (old.id * 4, old.id * 4 + 1);
+        INSERT INTO notes_fts (rowid, body, kind, entry_id)
+            SELECT new.id * 4, new.notes, 'notes', new.id WHERE new.notes IS NOT NULL;
+        INSERT INTO notes_fts (rowid, body, kind, entry_id)
+            SELECT new.id * 4 + 1, new.workout_notes, 'workout_notes', new.id WHERE new.workout_notes IS NOT NULL;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS daily_entries_fts_delete AFTER DELETE ON daily_entries BEGIN
+        DELETE FROM notes_fts WHERE rowid IN (old.id * 4, old.id * 4 + 1);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS health_issues_fts_insert AFTER INSERT ON health_issues BEGIN
+        INSERT INTO notes_fts (rowid, body, kind, entry_id)
+            SELECT new.id * 4 + 2, new.notes, 'issue', new.daily_entry_id WHERE new.notes IS NOT NULL;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS health_issues_fts_update AFTER UPDATE OF notes ON health_issues BEGIN
+        DELETE FROM notes_fts WHERE rowid = old.id * 4 + 2;
+        INSERT INTO notes_fts (rowid, body, kind, entry_id)
+            SELECT new.id * 4 + 2, new.notes, 'issue', new.daily_entry_id WHERE new.notes IS NOT NULL;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS health_issues_fts_delete AFTER DELETE ON health_issues BEGIN
+        DELETE FROM notes_fts WHERE rowid = old.id * 4 + 2;
+    END
+    """,
+]
+
+_BACKFILL = [
+    "INSERT INTO notes_fts (rowid, body, kind, entry_id) "
+    "SELECT id * 4, notes, 'notes', id FROM daily_entries WHERE notes IS NOT NULL",
+    "INSERT INTO notes_fts (rowid, body, kind, entry_id) "
+    "SELECT id * 4 + 1, workout_notes, 'workout_notes', id FROM daily_entries WHERE workout_notes IS NOT NULL",
+    "INSERT INTO notes_fts (rowid, body, kind, entry_id) "
+    "SELECT id * 4 + 2, notes, 'issue', daily_entry_id FROM health_issues WHERE notes IS NOT NULL",
+]
+
+
+def is_supported(engine: Engine) -> bool:
+    return engine.dialect.name == "sqlite"
+
+
+def ensure_search_index(engine: Engine):
+    """Create the FTS table and triggers, indexing existing notes on first run"""
+    if not is_supported(engine):
+        return
+    with engine.begin() as conn:
+        exists = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'notes_fts'")
+        ).first()
+        for statement in _SCHEMA:
+            conn.execute(text(statement))
+        if not exists:
+            for statement in _BACKFILL:
+                conn.execute(text(statement))
+
+
+def to_match_query(query: str) -> str | None:
+    """Turn free text into a safe FTS5 query: every word must match, last one as a prefix"""
+    words = re.findall(r"\w+", query)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def _render_snippet(snippet: str) -> str:
+    # Escape the note text itself, then turn the FTS markers into <mark> tags
+    escaped = html.escape(snippet)
+    return escaped.replace(_HIGHLIGHT_START, "<mark>").replace(_HIGHLIGHT_END, "</mark>")
+
+
+def search_notes(db: Session, query: str, skip: int = 0, limit: int = 20) -> dict:
+    """Ranked (bm25) matches with highlighted snippets, newest entry first on ties"""
+    match = to_match_query(query)
+    if match is None:
+        return {"query": query, "total": 0, "hits": []}
+
+    total = db.execute(
+        text("SELECT count(*) FROM notes_fts WHERE notes_fts MATCH :match"), {"match": match}
+    ).scalar_one()
+
+    rows = db.execute(
+        text(
+            """
+            SELECT f.kind, f.entry_id, e.date,
+                   snippet(notes_fts, 0, :start, :end, '…', 16) AS snippet,
+                   bm25(notes_fts) AS rank
+            FROM notes_fts AS f
+            JOIN daily_entries AS e ON e.id = f.entry_id
+            WHERE notes_fts MATCH :match
+            ORDER BY rank, e.date DESC
+            LIMIT :limit OFFSET :skip
+            """
+        ),
+        {"match": match, "start": _HIGHLIGHT_START, "end": _HIGHLIGHT_END, "limit": limit, "skip": skip},
+    ).all()
+
+    return {
+        "query": query,
+        "total": total,
+        "hits": [
+            {
+                "kind": row.kind,
+                "entry_id": row.entry_id,
+                "date": row.date,
+                "snippet": _render_snippet(row.snippet),
+                "rank": row.rank,
+            }
+            for row in rows
+        ],
+    }
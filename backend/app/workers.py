@@ -0,0 +1,150 @@
+"""Support for serving the app from several worker processes (Settings.workers).
+
+Two things change once more than one process serves requests:
+
+- Startup work (migrations, seeding, rollup backfill) must not run in
+  several workers at once, and need only run once per server run.
+  startup_once() serializes workers on a lock file and lets only the first
+  one of a run (identified by RUN_ID_ENV, set by ``python -m app``) do it.
+- The in-process query cache and the ETag counters would drift apart per
+  worker. SharedVersions keeps the counters in the data_versions table and,
+  before each request, picks up counters bumped by other workers, dropping
+  the cached reads they cover. On SQLite the check is a PRAGMA data_version
+  on a private connection, which only changes after another connection
+  commits, so an idle database costs no queries at all. Other databases are
+  polled at most every POLL_SECONDS, off the event loop.
+"""
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine
+
+from . import models
+from .cache import data_versions, query_cache
+from .config import DATA_DIR
+
+try:
+    import fcntl
+except ImportError:  # Windows: multi-worker mode is not supported there
+    fcntl = None
+
+STARTUP_LOCK = DATA_DIR / "startup.lock"
+# Random per `python -m app` invocation and inherited by its workers
+RUN_ID_ENV = "HEALTHIFY_RUN_ID"
+BOOT_NAMESPACE = "boot"
+POLL_SECONDS = 1.0  # how stale another worker's writes may look on non-SQLite databases
+
+
+@contextmanager
+def startup_once(workers: int):
+    """Yields whether this process should run the one-time startup work.
+
+    The startup work is idempotent, so without a run id every worker runs it
+    in turn under the lock. With one, the lock file records it once startup
+    succeeded and later workers of the same run (including restarted ones)
+    skip it; a new run, e.g. a container restart with a newer image, always
+    does it again. If the startup work raises, nothing is recorded and the
+    next worker retries.
+    """
+    if workers <= 1 or fcntl is None:
+        yield True
+        return
+
+    run_id = os.environ.get(RUN_ID_ENV, "")
+    with open(STARTUP_LOCK, "a+") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            lock.seek(0)
+            yield not run_id or lock.read().strip() != run_id
+            lock.seek(0)
+            lock.truncate()
+            lock.write(run_id)
+            lock.flush()
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+class SharedVersions:
+    """Data version counters stored in the database and shared by all workers"""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self._lock = threading.Lock()
+        self._gate: sqlite3.Connection | None = None
+        self._gate_version = None
+        self._next_poll = 0.0
+        if engine.dialect.name == "sqlite":
+            self._gate = sqlite3.connect(engine.url.database, check_same_thread=False)
+
+    def publish(self, namespace: str) -> int:
+        """Increment a namespace's shared counter and return its new value"""
+        table = models.DataVersion.__table__
+        insert = (sqlite.insert if self.engine.dialect.name == "sqlite" else postgresql.insert)(table)
+        stmt = insert.values(namespace=namespace, version=1).on_conflict_do_update(
+            index_elements=[table.c.namespace],
+            set_={"version": table.c.version + 1},
+        ).returning(table.c.version)
+        with self.engine.begin() as conn:
+            return conn.execute(stmt).scalar_one()
+
+    def _changed(self) -> bool:
+        if self._gate is not None:
+            with self._lock:
+                version = self._gate.execute("PRAGMA data_version").fetchone()[0]
+                changed, self._gate_version = version != self._gate_version, version
+            return changed
+        now = time.monotonic()
+        if now < self._next_poll:
+            return False
+        self._next_poll = now + POLL_SECONDS
+        return True
+
+    async def refresh(self):
+        """Adopt counters bumped by other workers and drop the cache entries they cover"""
+        if not self._changed():
+            return
+        if self._gate is not None:
+            versions = self._read()  # a local file read, cheap enough for the event loop
+        else:
+            versions = await run_in_threadpool(self._read)
+        for namespace in data_versions.merge(versions):
+            query_cache.invalidate(namespace)
+        data_versions.boot_id = f"shared-{versions.get(BOOT_NAMESPACE, 0)}"
+
+    def _read(self) -> dict[str, int]:
+        if self._gate is not None:
+            with self._lock:
+                return dict(self._gate.execute("SELECT namespace, version FROM data_versions").fetchall())
+        table = models.DataVersion.__table__
+        with self.engine.connect() as conn:
+            return dict(conn.execute(select(table.c.namespace, table.c.version)).all())
+
+    def new_boot(self):
+        """Start a new ETag epoch; called once per deployment from startup"""
+        self.publish(BOOT_NAMESPACE)
+
+
+class SharedVersionsMiddleware:
+    """Brings this worker's caches up to date before each request"""
+
+    def __init__(self, app, shared: SharedVersions):
+        self.app = app
+        self.shared = shared
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            await self.shared.refresh()
+        await self.app(scope, receive, send)
+
+
+def enable_shared_versions(app, engine: Engine) -> SharedVersions:
+    shared = SharedVersions(engine)
+    data_versions.publisher = shared.publish
+    app.add_middleware(SharedVersionsMiddleware, shared=shared)
+    return shared
@@ -0,0 +1,4 @@
+"""Benchmarks for the backend's hot paths.
+
+Run from the backend directory with ``python -m benchmarks --help``.
+"""
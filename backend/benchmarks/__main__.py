@@ -0,0 +1,185 @@
+"""Command line entry point: ``python -m benchmarks {run,compare}``.
+
+    # 3 years of data, micro-benchmarks and a 50-client read load test
+    python -m benchmarks run --out baseline.json
+
+    # Fail (exit 1) when the trends p95 over 10 years of data exceeds 150 ms
+    python -m benchmarks run --suite micro --years 10 --budget analytics.get_trends=150
+
+    # Fail (exit 1) when any p95 grew more than 15% against the baseline
+    python -m benchmarks compare baseline.json current.json --metric p95_ms --threshold 0.15
+
+App settings come from the environment as usual, so configurations are
+compared by running twice, e.g.::
+
+    python -m benchmarks run --suite load --clients 200 --out sync.json
+    ASYNC_DB=true python -m benchmarks run --suite load --clients 200 --out async.json
+    SQLITE_JOURNAL_MODE=delete python -m benchmarks run --suite load --scenario mixed --out delete.json
+
+The scaling suite starts real ``python -m app`` servers instead, one per
+worker count, and load-tests them over HTTP::
+
+    python -m benchmarks run --suite scaling --workers 1,2,4 --clients 64 --out scaling.json
+    METRICS_ENABLED=true python -m benchmarks run --suite load --out instrumented.json
+
+The serialization suite measures CPU per request of /api/entries and
+/api/workouts with the default and the FAST_JSON response path side by side::
+
+    python -m benchmarks run --suite serialization --repeat 200 --out serialization.json
+
+Unless DATABASE_URL is set, each run generates into a throwaway SQLite file.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+def _prepare_database():
+    """Point the app at a fresh database before any app module is imported"""
+    if not os.environ.get("DATABASE_URL"):
+        workdir = tempfile.mkdtemp(prefix="healthify-bench-")
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(workdir) / 'bench.db'}"
+
+
+def run(args) -> int:
+    _prepare_database()
+
+    from app.config import get_settings
+    from app.database import SessionLocal, async_engine, engine
+    from app.migrations import run_migrations
+    from app.search import ensure_search_index
+
+    from . import load, micro, scaling, serialization
+    from .generator import generate
+    from .harness import check_budgets, environment_meta, new_results, watch_queries, write_results
+
+    settings = get_settings()
+    run_migrations(engine)
+    ensure_search_index(engine)
+    watch_queries(engine)
+    if async_engine is not None:
+        watch_queries(async_engine.sync_engine)
+
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        data = generate(db, years=args.years, seed=args.seed, samples=args.samples)
+    print(f"Generated {data.entries} entries, {data.issues} issues and {data.samples} samples "
+          f"in {time.perf_counter() - started:.1f}s")
+
+    results = new_results(environment_meta(
+        label=args.label,
+        database=engine.dialect.name,
+        async_db=settings.async_db,
+        metrics_enabled=settings.metrics_enabled,
+        fast_json=settings.fast_json,
+        gzip_min_size=settings.gzip_min_size,
+        sqlite_journal_mode=settings.sqlite_journal_mode,
+        sqlite_synchronous=settings.sqlite_synchronous,
+        years=args.years,
+        seed=args.seed,
+        entries=data.entries,
+        issues=data.issues,
+        samples=data.samples,
+    ))
+
+    suites = set(args.suite.split(","))
+    # The load tests run first: micro's write benchmarks grow the data they read
+    if "load" in suites:
+        from app.main import app
+
+        print(f"Load ({args.scenario}, {args.clients} clients x {args.requests} requests):")
+        results["benchmarks"].update(load.run(
+            app, data, scenario=args.scenario, clients=args.clients, requests=args.requests, seed=args.seed
+        ))
+    if "scaling" in suites:
+        print(f"Scaling ({args.scenario}, {args.clients} clients x {args.requests} requests):")
+        results["benchmarks"].update(scaling.run(
+            data, [int(n) for n in args.workers.split(",")], scenario=args.scenario,
+            clients=args.clients, requests=args.requests, seed=args.seed,
+        ))
+    if "serialization" in suites:
+        from app.main import app
+
+        print("Serialization:")
+        results["benchmarks"].update(serialization.run(app, repeat=args.repeat))
+    if "micro" in suites:
+        print("Micro:")
+        results["benchmarks"].update(micro.run(data, repeat=args.repeat, only=args.only))
+
+    over_budget = check_budgets(results["benchmarks"], {**micro.P95_BUDGETS_MS, **dict(args.budget)})
+    for name in over_budget:
+        row = results["benchmarks"][name]
+        print(f"OVER BUDGET: {name} p95 {row['p95_ms']:.3f} ms > {row['p95_budget_ms']:g} ms")
+
+    if args.out:
+        write_results(args.out, results)
+        print(f"Wrote {args.out}")
+    return 1 if over_budget else 0
+
+
+def _budget(value: str) -> tuple[str, float]:
+    name, _, ms = value.partition("=")
+    try:
+        return name, float(ms)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected NAME=MS, got {value!r}")
+
+
+def compare(args) -> int:
+    from .harness import compare as compare_results, load_results
+
+    rows = compare_results(load_results(args.baseline), load_results(args.current), args.metric, args.threshold)
+    regressions = 0
+    for row in rows:
+        if row["change"] is None:
+            status = "missing" if row["baseline"] is None or row["current"] is None else "-"
+            change = ""
+        else:
+            status = "REGRESSED" if row["regressed"] else "ok"
+            change = f"{row['change']:+.1%}"
+        regressions += row["regressed"]
+        print(f"{row['name']:<55} {row['baseline'] or '':>10} {row['current'] or '':>10} {change:>8}  {status}")
+    print(f"{regressions} regression(s) in {args.metric} above {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="generate data and run the suites")
+    run_parser.add_argument("--years", type=int, default=3, help="years of daily entries to generate")
+    run_parser.add_argument("--seed", type=int, default=42)
+    run_parser.add_argument("--samples", type=int, default=0,
+                            help="device samples to generate over the last 30 days (e.g. 50000000)")
+    run_parser.add_argument("--suite", default="micro,load", help="comma separated: micro, load, scaling, serialization")
+    run_parser.add_argument("--repeat", type=int, default=50, help="timed calls per micro-benchmark")
+    run_parser.add_argument("--only", help="run only micro-benchmarks whose name contains this")
+    run_parser.add_argument("--scenario", choices=["read", "mixed"], default="read")
+    run_parser.add_argument("--clients", type=int, default=50, help="concurrent load-test clients")
+    run_parser.add_argument("--requests", type=int, default=20, help="requests per load-test client")
+    run_parser.add_argument("--workers", default="1,2,4", help="worker counts for the scaling suite")
+    run_parser.add_argument("--label", help="free-form note stored in the results metadata")
+    run_parser.add_argument("--out", help="write results JSON here")
+    run_parser.add_argument("--budget", type=_budget, action="append", default=[], metavar="NAME=MS",
+                            help="p95 budget for benchmarks whose name starts with NAME; exit 1 when exceeded")
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = commands.add_parser("compare", help="diff two results files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--metric", default="p50_ms")
+    compare_parser.add_argument("--threshold", type=float, default=0.10,
+                                help="relative growth that counts as a regression")
+    compare_parser.set_defaults(handler=compare)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""Seeded synthetic data: entries, issues, routines and device samples.
+
+The same seed and arguments always produce the same rows relative to `end`,
+so two runs over the same generated database are comparable.
+"""
+import random
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app import crud, models, schemas
+from app.devices import refresh_daily_summaries, refresh_hourly_rollups
+from app.rollups import rebuild_rollups
+
+TIMES_OF_DAY = [None, "morning", "afternoon", "evening", "night"]
+WORDS = (
+    "slept badly coffee headache after lunch long walk felt great stiff neck "
+    "migraine again busy meeting late dinner light run skipped breakfast tired "
+    "anxious before presentation calm weekend stretched hydrated poorly"
+).split()
+METRICS = ("heart_rate", "steps")
+CHUNK_SIZE = 5000
+
+
+@dataclass
+class Dataset:
+    """What generate() wrote, for benchmarks that need to address real rows"""
+    start: date
+    end: date
+    entries: int
+    issues: int
+    samples: int
+    routine_id: int
+    entry_dates: list[date]
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def _entries(rng: random.Random, start: date, end: date, issue_types: list[str]):
+    """Yield (entry row, issue rows) for roughly nine days in ten"""
+    entry_id = 0
+    day = start
+    while day <= end:
+        if rng.random() < 0.9:
+            entry_id += 1
+            stress = min(10, max(1, round(rng.gauss(5, 2))))
+            entry = {
+                "id": entry_id,
+                "date": day,
+                "stress_level": stress if rng.random() < 0.95 else None,
+                "worked_out": rng.random() < 0.5,
+                "workout_notes": _sentence(rng, 4) if rng.random() < 0.2 else None,
+                "notes": _sentence(rng, rng.randint(3, 12)) if rng.random() < 0.4 else None,
+            }
+            # Stressful days log more symptoms so the correlation report has signal
+            issue_count = rng.choices([0, 1, 2, 3], weights=[6, 3, 1 + stress // 4, stress // 5])[0]
+            issues = [
+                {
+                    "daily_entry_id": entry_id,
+                    "issue_type": issue_type,
+                    "severity": rng.randint(1, 10) if rng.random() < 0.7 else None,
+                    "notes": _sentence(rng, 3) if rng.random() < 0.15 else None,
+                    "time_of_day": rng.choice(TIMES_OF_DAY),
+                }
+                for issue_type in rng.sample(issue_types, issue_count)
+            ]
+            yield entry, issues
+        day += timedelta(days=1)
+
+
+def _insert_chunks(db: Session, table, rows):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= CHUNK_SIZE:
+            db.execute(insert(table), chunk)
+            chunk = []
+    if chunk:
+        db.execute(insert(table), chunk)
+
+
+def _routine(rng: random.Random, name: str, is_active: bool) -> schemas.WorkoutRoutineCreate:
+    days = [
+        schemas.WorkoutDayCreate(
+            name=f"Day {day_of_week + 1}",
+            day_of_week=day_of_week,
+            sort_order=day_of_week,
+            exercises=[
+                schemas.ExerciseCreate(
+                    name=f"Exercise {day_of_week + 1}.{n + 1}",
+                    target_sets=rng.randint(2, 5),
+                    target_reps=f"{rng.randint(5, 12)}",
+                    rest_seconds=rng.choice([60, 90, 120]),
+                    sort_order=n,
+                )
+                for n in range(5)
+            ],
+        )
+        for day_of_week in range(7)
+    ]
+    return schemas.WorkoutRoutineCreate(name=name, is_active=is_active, days=days)
+
+
+def _samples(rng: random.Random, start: datetime, end: datetime, per_metric: int, metric: str):
+    step = (end - start) / per_metric
+    value = 70.0 if metric == "heart_rate" else 0.0
+    for n in range(per_metric):
+        if metric == "heart_rate":
+            value = min(190.0, max(40.0, value + rng.gauss(0, 2)))
+        else:
+            value = float(max(0, round(rng.gauss(40, 30))))
+        yield {"metric": metric, "timestamp": start + step * n, "value": value}
+
+
+def generate(
+    db: Session,
+    years: int = 3,
+    seed: int = 42,
+    end: date | None = None,
+    samples: int = 0,
+) -> Dataset:
+    """Fill an empty, migrated database with `years` of history ending at `end`.
+
+    `samples` device samples are spread evenly over the last 30 days across
+    METRICS, and their daily and hourly rollups are built afterwards.
+    """
+    if db.scalar(select(models.DailyEntry.id).limit(1)) is not None:
+        raise RuntimeError("generate() needs an empty database")
+
+    rng = random.Random(seed)
+    end = end or date.today()
+    start = end - timedelta(days=365 * years - 1)
+
+    crud.seed_default_issue_types(db)
+    issue_types = sorted(db.scalars(select(models.IssueType.name)))
+
+    entry_dates = []
+    issue_rows: list[dict] = []
+    issue_count = 0
+
+    def entry_rows():
+        nonlocal issue_count
+        for entry, issues in _entries(rng, start, end, issue_types):
+            entry_dates.append(entry["date"])
+            issue_rows.extend(issues)
+            issue_count += len(issues)
+            yield entry
+
+    _insert_chunks(db, models.DailyEntry.__table__, entry_rows())
+    _insert_chunks(db, models.HealthIssue.__table__, issue_rows)
+    db.commit()
+    rebuild_rollups(db)
+
+    routine = crud.create_workout_routine(db, _routine(rng, "Benchmark split", is_active=True))
+    for n in range(3):
+        crud.create_workout_routine(db, _routine(rng, f"Archived split {n + 1}", is_active=False))
+
+    if samples:
+        sample_end = datetime.combine(end + timedelta(days=1), time())
+        sample_start = sample_end - timedelta(days=30)
+        per_metric = samples // len(METRICS)
+        for metric in METRICS:
+            _insert_chunks(db, models.DeviceSample.__table__, _samples(rng, sample_start, sample_end, per_metric, metric))
+            keys = {(metric, sample_start), (metric, sample_end - timedelta(hours=1))}
+            refresh_hourly_rollups(db, keys)
+            refresh_daily_summaries(db, {(metric, day.date()) for _, day in keys})
+            db.commit()
+
+    return Dataset(
+        start=start,
+        end=end,
+        entries=len(entry_dates),
+        issues=issue_count,
+        samples=samples // len(METRICS) * len(METRICS),
+        routine_id=routine.id,
+        entry_dates=entry_dates,
+    )
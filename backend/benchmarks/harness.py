@@ -0,0 +1,169 @@
+"""Timing, query counting and the JSON results format shared by the suites.
+
+A results file looks like::
+
+    {
+      "version": 1,
+      "meta": {"commit": "...", "python": "...", "sqlite": "...", ...},
+      "benchmarks": {
+        "crud.get_stats": {"n": 50, "mean_ms": ..., "p50_ms": ..., "p95_ms": ...,
+                           "p99_ms": ..., "min_ms": ..., "max_ms": ...,
+                           "queries_per_op": ..., "cpu_ms_per_op": ...},
+        ...
+      }
+    }
+
+Load-test entries carry the same fields plus "rps" (and no "cpu_ms_per_op").
+Entries under a latency budget (see check_budgets) also carry "p95_budget_ms"
+and "over_budget".
+"""
+import json
+import math
+import platform
+import sqlite3
+import subprocess
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+RESULTS_VERSION = 1
+
+_query_count: ContextVar[list[int] | None] = ContextVar("benchmark_query_count", default=None)
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    counter = _query_count.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def watch_queries(engine: Engine):
+    """Count statements run on `engine` inside counting() blocks"""
+    if not event.contains(engine, "before_cursor_execute", _count_query):
+        event.listen(engine, "before_cursor_execute", _count_query)
+
+
+@contextmanager
+def counting():
+    """Count the statements issued in this context, including threadpool hops"""
+    counter = [0]
+    token = _query_count.set(counter)
+    try:
+        yield counter
+    finally:
+        _query_count.reset(token)
+
+
+def percentile(ordered: list[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(q * len(ordered) / 100))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(seconds: list[float], queries: list[int]) -> dict:
+    ordered = sorted(s * 1000 for s in seconds)
+    return {
+        "n": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered), 4) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 50), 4),
+        "p95_ms": round(percentile(ordered, 95), 4),
+        "p99_ms": round(percentile(ordered, 99), 4),
+        "min_ms": round(ordered[0], 4) if ordered else 0.0,
+        "max_ms": round(ordered[-1], 4) if ordered else 0.0,
+        "queries_per_op": round(sum(queries) / len(queries), 2) if queries else 0.0,
+    }
+
+
+def time_calls(op: Callable[[int], object], repeat: int, warmup: int = 3) -> dict:
+    """Run op(i) `warmup` + `repeat` times and summarize the timed calls.
+
+    cpu_ms_per_op is process CPU time (all threads) per call, which unlike
+    wall time is not hidden by I/O waits.
+    """
+    for i in range(warmup):
+        op(i)
+    seconds, queries, cpu = [], [], 0.0
+    for i in range(warmup, warmup + repeat):
+        with counting() as counter:
+            cpu_started = time.process_time()
+            started = time.perf_counter()
+            op(i)
+            seconds.append(time.perf_counter() - started)
+            cpu += time.process_time() - cpu_started
+        queries.append(counter[0])
+    return {**summarize(seconds, queries), "cpu_ms_per_op": round(cpu * 1000 / repeat, 4) if repeat else 0.0}
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment_meta(**extra) -> dict:
+    return {
+        "commit": _git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "sqlite": sqlite3.sqlite_version,
+        **extra,
+    }
+
+
+def new_results(meta: dict) -> dict:
+    return {"version": RESULTS_VERSION, "meta": meta, "benchmarks": {}}
+
+
+def write_results(path: str | Path, results: dict):
+    Path(path).write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+
+
+def load_results(path: str | Path) -> dict:
+    results = json.loads(Path(path).read_text())
+    if results.get("version") != RESULTS_VERSION:
+        raise ValueError(f"{path}: unsupported results version {results.get('version')!r}")
+    return results
+
+
+def compare(baseline: dict, current: dict, metric: str = "p50_ms", threshold: float = 0.10) -> list[dict]:
+    """Per-benchmark change in `metric`; a row regresses when it grows by more than `threshold`"""
+    rows = []
+    for name in sorted(baseline["benchmarks"].keys() | current["benchmarks"].keys()):
+        before = baseline["benchmarks"].get(name, {}).get(metric)
+        after = current["benchmarks"].get(name, {}).get(metric)
+        change = (after - before) / before if before and after is not None else None
+        rows.append({
+            "name": name,
+            "baseline": before,
+            "current": after,
+            "change": change,
+            "regressed": change is not None and change > threshold,
+        })
+    return rows
+
+
+def check_budgets(benchmarks: dict[str, dict], budgets: dict[str, float]) -> list[str]:
+    """Flag rows whose p95 exceeds the budget of the longest name prefix they match; returns their names"""
+    over = []
+    for name, row in benchmarks.items():
+        matching = [prefix for prefix in budgets if name.startswith(prefix)]
+        if not matching or budgets[max(matching, key=len)] <= 0:
+            continue
+        row["p95_budget_ms"] = budgets[max(matching, key=len)]
+        row["over_budget"] = row["p95_ms"] > row["p95_budget_ms"]
+        if row["over_budget"]:
+            over.append(name)
+    return over
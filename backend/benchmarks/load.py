@@ -0,0 +1,158 @@
+"""In-process ASGI load driver for the API routes.
+
+Concurrent clients share one httpx.AsyncClient wired straight to the app, so
+requests go through routing, validation, serialization and the database with
+no network in between. Each request's statements are counted through the
+harness context variable, which follows sync routes into the threadpool.
+The same driver can target a real server over HTTP (see scaling.py).
+"""
+import asyncio
+import random
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Callable
+
+import httpx
+
+from .generator import Dataset, METRICS
+from .harness import counting, summarize
+
+# name -> (weight, request builder); builders return (method, url, json body)
+Request = tuple[str, str, object]
+Scenario = dict[str, tuple[int, Callable[[random.Random, Dataset], Request]]]
+
+
+def _day(rng: random.Random, data: Dataset) -> str:
+    return rng.choice(data.entry_dates).isoformat()
+
+
+READ: Scenario = {
+    "GET /entries": (6, lambda rng, data: ("GET", "/api/entries?limit=30", None)),
+    "GET /entries/{date}": (6, lambda rng, data: ("GET", f"/api/entries/{_day(rng, data)}", None)),
+    "GET /today": (4, lambda rng, data: ("GET", "/api/today", None)),
+    "GET /stats": (4, lambda rng, data: ("GET", "/api/stats", None)),
+    "GET /calendar/{year}/{month}": (3, lambda rng, data: (
+        "GET", "/api/calendar/{0.year}/{0.month}".format(rng.choice(data.entry_dates)), None
+    )),
+    "GET /workouts/today": (3, lambda rng, data: ("GET", "/api/workouts/today", None)),
+    "GET /issue-types": (2, lambda rng, data: ("GET", "/api/issue-types", None)),
+    "GET /analytics/trends": (1, lambda rng, data: (
+        "GET", f"/api/analytics/trends?start_date={data.end - timedelta(days=89)}&end_date={data.end}", None
+    )),
+    "GET /search": (1, lambda rng, data: ("GET", "/api/search?q=coffee", None)),
+}
+
+WRITE: Scenario = {
+    "PUT /entries/{date}": (2, lambda rng, data: (
+        "PUT", f"/api/entries/{_day(rng, data)}", {"stress_level": rng.randint(1, 10)}
+    )),
+    "PATCH /entries/{date}/issues": (2, lambda rng, data: (
+        "PATCH", f"/api/entries/{_day(rng, data)}/issues",
+        {"issue_type": "headache", "selected": rng.random() < 0.5},
+    )),
+}
+
+SCENARIOS: dict[str, Scenario] = {
+    "read": READ,
+    # Readers racing writers; compare runs across journal modes / pragmas
+    "mixed": {**READ, **WRITE},
+}
+
+
+def _with_metrics(data: Dataset) -> Scenario:
+    end = datetime.combine(data.end + timedelta(days=1), datetime.min.time())
+    start = end - timedelta(days=7)
+    return {
+        "GET /metrics/{name}": (2, lambda rng, data: (
+            "GET", f"/api/metrics/{METRICS[0]}?start={start.isoformat()}&end={end.isoformat()}&bucket=hour", None
+        )),
+    }
+
+
+async def _client(
+    http: httpx.AsyncClient,
+    rng: random.Random,
+    data: Dataset,
+    scenario: Scenario,
+    requests: int,
+    samples: dict[str, tuple[list[float], list[int]]],
+    errors: dict[str, int],
+):
+    names = list(scenario)
+    weights = [scenario[name][0] for name in names]
+    for _ in range(requests):
+        name = rng.choices(names, weights)[0]
+        method, url, body = scenario[name][1](rng, data)
+        with counting() as counter:
+            started = time.perf_counter()
+            response = await http.request(method, url, json=body)
+            elapsed = time.perf_counter() - started
+        if response.status_code >= 400:
+            errors[name] += 1
+            continue
+        seconds, queries = samples[name]
+        seconds.append(elapsed)
+        queries.append(counter[0])
+
+
+async def _drive(client_options: dict, data: Dataset, scenario: Scenario, clients: int, requests: int, seed: int):
+    samples = defaultdict(lambda: ([], []))
+    errors = defaultdict(int)
+    async with httpx.AsyncClient(**client_options) as http:
+        started = time.perf_counter()
+        await asyncio.gather(*(
+            _client(http, random.Random(seed + n), data, scenario, requests, samples, errors)
+            for n in range(clients)
+        ))
+        wall = time.perf_counter() - started
+    return samples, errors, wall
+
+
+def run(
+    app,
+    data: Dataset,
+    scenario: str = "read",
+    clients: int = 50,
+    requests: int = 20,
+    seed: int = 42,
+    base_url: str | None = None,
+    prefix: str = "load",
+) -> dict[str, dict]:
+    """Drive `clients` concurrent clients for `requests` requests each.
+
+    Requests go straight to `app` in-process, or over HTTP to `base_url` when
+    given (then `app` is unused and queries cannot be counted). Returns a
+    summary per route plus an "all" row; every row carries the achieved
+    requests per second over the whole run.
+    """
+    routes = dict(SCENARIOS[scenario])
+    if data.samples:
+        routes.update(_with_metrics(data))
+
+    if base_url is None:
+        client_options = {"transport": httpx.ASGITransport(app=app), "base_url": "http://benchmark"}
+    else:
+        limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+        client_options = {"base_url": base_url, "limits": limits, "timeout": 60}
+    samples, errors, wall = asyncio.run(_drive(client_options, data, routes, clients, requests, seed))
+
+    results = {}
+    all_seconds, all_queries = [], []
+    for name in sorted(samples):
+        seconds, queries = samples[name]
+        all_seconds += seconds
+        all_queries += queries
+        results[f"{prefix}.{scenario}.{name}"] = {**summarize(seconds, queries), "rps": round(len(seconds) / wall, 2)}
+    results[f"{prefix}.{scenario}.all"] = {
+        **summarize(all_seconds, all_queries),
+        "rps": round(len(all_seconds) / wall, 2),
+        "clients": clients,
+        "errors": sum(errors.values()),
+    }
+    for name, row in results.items():
+        print(f"  {name:<55} p50 {row['p50_ms']:>9.3f} ms  p99 {row['p99_ms']:>9.3f} ms  "
+              f"queries {row['queries_per_op']}")
+    if errors:
+        print(f"  errors: {dict(errors)}")
+    return results
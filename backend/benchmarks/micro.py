@@ -0,0 +1,173 @@
+"""Micro-benchmarks: one crud/analytics call per operation, on a fresh session.
+
+The in-process query cache is cleared before every call, so each number is
+the cost of the work itself rather than of a cache hit.
+"""
+from datetime import date, datetime, time, timedelta
+from typing import Callable
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import analytics, crud, devices, models, schemas, search
+from app.cache import query_cache
+from app.database import SessionLocal, engine
+
+from .generator import Dataset, METRICS
+from .harness import time_calls
+
+PAGE_SIZE = 30
+# p95 latency budgets (ms) by benchmark name prefix; `run --budget NAME=MS` overrides them, 0 disables
+P95_BUDGETS_MS = {
+    # One query and a vectorized pass: 10 years (`--years 10`) of get_trends.all take ~100 ms
+    "analytics.get_trends": 250.0,
+}
+# Current streaks get_stats is timed at; its cost should not grow with them
+STREAK_LENGTHS = (10, 100, 1000, 5000)
+
+Op = Callable[[int], object]
+
+
+def _on_session(call: Callable) -> Op:
+    def op(i: int):
+        query_cache.clear()
+        with SessionLocal() as db:
+            return call(db, i)
+    return op
+
+
+def _read_benchmarks(data: Dataset) -> dict[str, Op]:
+    newest_first = data.entry_dates[::-1]
+    deep = max(0, len(newest_first) - PAGE_SIZE)
+    middle = data.entry_dates[len(data.entry_dates) // 2]
+    year_ago = data.end - timedelta(days=364)
+
+    benchmarks = {
+        "crud.get_daily_entry": lambda db, i: crud.get_daily_entry(db, data.entry_dates[i % len(data.entry_dates)]),
+        "crud.get_daily_entries.first_page": lambda db, i: crud.get_daily_entries(db, limit=PAGE_SIZE),
+        # The same last page, addressed by offset and by keyset cursor
+        "crud.get_daily_entries.deep_offset": lambda db, i: crud.get_daily_entries(db, skip=deep, limit=PAGE_SIZE),
+        "crud.get_daily_entries.deep_cursor": lambda db, i: crud.get_daily_entries(
+            db, limit=PAGE_SIZE, before=newest_first[deep - 1] if deep else None
+        ),
+        "crud.get_calendar_month": lambda db, i: crud.get_calendar_month(db, middle.year, middle.month),
+        "crud.get_stats": lambda db, i: crud.get_stats(db),
+        "crud.get_stats.year": lambda db, i: crud.get_stats(db, days=365),
+        "crud.get_streaks": lambda db, i: crud.get_streaks(db),
+        "crud.get_issue_types": lambda db, i: crud.get_issue_types(db),
+        "crud.get_todays_workout": lambda db, i: crud.get_todays_workout(db),
+        "analytics.get_trends.year": lambda db, i: analytics.get_trends(db, year_ago, data.end),
+        "analytics.get_trends.all": lambda db, i: analytics.get_trends(db, data.start, data.end),
+        "analytics.get_correlation_report": lambda db, i: analytics.get_correlation_report(db),
+    }
+    if search.is_supported(engine):
+        benchmarks["search.search_notes"] = lambda db, i: search.search_notes(db, "coffee headache")
+    if data.samples:
+        end = datetime.combine(data.end + timedelta(days=1), time())
+        for bucket, days in (("hour", 7), ("day", 30)):
+            benchmarks[f"devices.get_metric_series.{bucket}"] = (
+                lambda db, i, bucket=bucket, days=days: devices.get_metric_series(
+                    db, METRICS[0], end - timedelta(days=days), end, bucket
+                )
+            )
+    return benchmarks
+
+
+def _write_benchmarks(data: Dataset) -> dict[str, Op]:
+    recent = data.entry_dates[-PAGE_SIZE:]
+
+    def update_entry(db, i):
+        issues = [schemas.HealthIssueCreate(issue_type="headache", severity=1 + i % 10)]
+        if i % 2:
+            issues.append(schemas.HealthIssueCreate(issue_type="fatigue", time_of_day="evening"))
+        update = schemas.DailyEntryUpdate(stress_level=1 + i % 10, health_issues=issues)
+        return crud.update_daily_entry(db, recent[i % len(recent)], update)
+
+    def toggle_issue(db, i):
+        toggle = schemas.HealthIssueToggle(issue_type="dizziness", time_of_day="morning", selected=bool(i % 2))
+        return crud.toggle_health_issue(db, recent[-1], toggle)
+
+    def create_entry(db, i):
+        # Before the generated history: dates after it would be in the future and skew later reads
+        entry = schemas.DailyEntryCreate(
+            date=data.start - timedelta(days=1 + i),
+            stress_level=5,
+            health_issues=[schemas.HealthIssueCreate(issue_type="headache")],
+        )
+        return crud.create_daily_entry(db, entry)
+
+    year = [
+        schemas.DailyEntryCreate(date=day, stress_level=1 + n % 10, worked_out=bool(n % 2),
+                                 health_issues=[schemas.HealthIssueCreate(issue_type="fatigue")])
+        for n, day in enumerate(data.entry_dates[-365:])
+    ]
+
+    routine = schemas.WorkoutRoutineCreate(
+        name="Micro routine",
+        is_active=False,
+        days=[
+            schemas.WorkoutDayCreate(
+                name=f"Day {d}",
+                day_of_week=d,
+                exercises=[schemas.ExerciseCreate(name=f"Exercise {d}.{e}") for e in range(5)],
+            )
+            for d in range(7)
+        ],
+    )
+
+    return {
+        "crud.update_daily_entry": update_entry,
+        "crud.toggle_health_issue": toggle_issue,
+        "crud.create_daily_entry": create_entry,
+        "crud.bulk_upsert_daily_entries.year": lambda db, i: crud.bulk_upsert_daily_entries(db, year),
+        "crud.create_workout_routine": lambda db, i: crud.create_workout_routine(db, routine),
+    }
+
+
+def _set_current_streak(db: Session, days: int):
+    """Log every day of the last max(STREAK_LENGTHS) + 1 except the one `days` days ago.
+
+    Only the gap moves between lengths, so the table size stays the same and
+    the timings differ by streak length alone.
+    """
+    today = date.today()
+    window = [today - timedelta(days=n) for n in range(max(STREAK_LENGTHS) + 1)]
+    logged = set(db.scalars(select(models.DailyEntry.date).where(models.DailyEntry.date >= window[-1])))
+    missing = [day for day in window if day not in logged and day != today - timedelta(days=days)]
+    crud.bulk_upsert_daily_entries(db, [schemas.DailyEntryCreate(date=day, stress_level=5) for day in missing])
+    crud.delete_daily_entry(db, today - timedelta(days=days))
+
+
+def _streak_benchmarks(repeat: int, only: str | None) -> dict[str, dict]:
+    """get_stats with current streaks of STREAK_LENGTHS days; fills in and deletes entries to get them"""
+    results = {}
+    for days in STREAK_LENGTHS:
+        name = f"crud.get_stats.streak_{days}"
+        if only and only not in name:
+            continue
+        with SessionLocal() as db:
+            _set_current_streak(db, days)
+            streak = crud.get_streaks(db)[0]
+        if streak != days:
+            raise RuntimeError(f"seeded a {days} day streak but get_streaks sees {streak}")
+        results[name] = {**time_calls(_on_session(lambda db, i: crud.get_stats(db)), repeat), "streak_days": days}
+    return results
+
+
+def run(data: Dataset, repeat: int = 50, only: str | None = None) -> dict[str, dict]:
+    """Time every micro-benchmark whose name contains `only` (all when None)"""
+    results = {}
+    # Reads go first so the writes don't change the data they measure
+    for name, call in {**_read_benchmarks(data), **_write_benchmarks(data)}.items():
+        if only and only not in name:
+            continue
+        # Whole-year bulk upserts are slow enough that a handful of runs is plenty
+        runs = max(3, repeat // 10) if name.endswith(".year") and "bulk" in name else repeat
+        results[name] = time_calls(_on_session(call), runs)
+        print(f"  {name:<45} p50 {results[name]['p50_ms']:>9.3f} ms  "
+              f"queries {results[name]['queries_per_op']}")
+    # Last, as they fill in and delete entries to shape the streak
+    for name, row in _streak_benchmarks(repeat, only).items():
+        results[name] = row
+        print(f"  {name:<45} p50 {row['p50_ms']:>9.3f} ms  queries {row['queries_per_op']}")
+    return results
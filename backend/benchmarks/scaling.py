@@ -0,0 +1,71 @@
+"""Read throughput of the real server (``python -m app``) by worker count.
+
+Each configuration starts a fresh server process tree on a free port against
+the generated database and drives the HTTP load test at it; keep-alive
+connections are spread over the workers by the kernel's accept balancing.
+"""
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+from . import load
+from .generator import Dataset
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+STARTUP_TIMEOUT = 60.0
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_healthy(base_url: str, server: subprocess.Popen):
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"server exited with {server.returncode} during startup")
+        try:
+            if httpx.get(f"{base_url}/api/health", timeout=1).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("server did not become healthy in time")
+
+
+def run(data: Dataset, workers: list[int], scenario: str = "read", clients: int = 64,
+        requests: int = 50, seed: int = 42) -> dict[str, dict]:
+    """Load-test one server per worker count; rows are named scaling.workers_<n>"""
+    results = {}
+    baseline_rps = None
+    for count in workers:
+        port = _free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        env = {**os.environ, "WORKERS": str(count), "HOST": "127.0.0.1", "PORT": str(port)}
+        server = subprocess.Popen(
+            [sys.executable, "-m", "app"], cwd=BACKEND_DIR, env=env,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            _wait_until_healthy(base_url, server)
+            print(f"  {count} worker(s):")
+            rows = load.run(None, data, scenario=scenario, clients=clients, requests=requests, seed=seed,
+                            base_url=base_url, prefix=f"scaling.workers_{count}")
+        finally:
+            server.terminate()
+            server.wait()
+
+        overall = rows[f"scaling.workers_{count}.{scenario}.all"]
+        baseline_rps = baseline_rps or overall["rps"]
+        overall["workers"] = count
+        overall["speedup"] = round(overall["rps"] / baseline_rps, 2)
+        print(f"  -> {overall['rps']} req/s, {overall['speedup']}x the first configuration")
+        results.update(rows)
+    return results
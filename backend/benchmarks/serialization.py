@@ -0,0 +1,86 @@
+"""CPU per request of the list endpoints, default vs fast_json response path.
+
+Both paths run in the same process against the same data by flipping
+Settings.fast_json between runs. Two kinds of rows are produced:
+
+- serialization.<endpoint>.<path>: the whole request through the app,
+  including the queries, as a client sees it.
+- serialization.encode.<endpoint>.<path>: only turning already loaded data
+  into response bytes, i.e. response_model validation plus FastAPI's encoder
+  for "default" and FastJSONResponse.render over row dicts for "fast".
+"""
+import json
+from typing import Callable
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+from app import crud, schemas
+from app.config import get_settings
+from app.database import SessionLocal
+from app.responses import FastJSONResponse, require_orjson
+
+from .harness import time_calls
+
+PAGE_SIZE = 100
+
+ENDPOINTS = {
+    "entries": (f"/api/entries?limit={PAGE_SIZE}", list[schemas.DailyEntry]),
+    "workouts": ("/api/workouts?active_only=false", list[schemas.WorkoutRoutine]),
+}
+
+
+def _default_encode(adapter: TypeAdapter, objects) -> bytes:
+    # What FastAPI's serialize_response and JSONResponse do with a response_model
+    validated = adapter.validate_python(objects, from_attributes=True)
+    return json.dumps(jsonable_encoder(validated), ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _encode_benchmarks() -> dict[str, Callable[[int], object]]:
+    with SessionLocal() as db:
+        loaded = {
+            "entries": (crud.get_daily_entries(db, limit=PAGE_SIZE), crud.get_daily_entry_rows(db, limit=PAGE_SIZE)),
+            "workouts": (crud.get_workout_routines(db, active_only=False),
+                         crud.get_workout_routine_rows(db, active_only=False)),
+        }
+        benchmarks = {}
+        for name, (objects, rows) in loaded.items():
+            adapter = TypeAdapter(ENDPOINTS[name][1])
+            benchmarks[f"serialization.encode.{name}.default"] = (
+                lambda i, adapter=adapter, objects=objects: _default_encode(adapter, objects)
+            )
+            benchmarks[f"serialization.encode.{name}.fast"] = (
+                lambda i, rows=rows: FastJSONResponse(rows).body
+            )
+        # Objects stay loaded after the session closes (expire_on_commit never fires)
+        return benchmarks
+
+
+def run(app, repeat: int = 50) -> dict[str, dict]:
+    """Time both response paths; returns rows named as in the module docstring"""
+    require_orjson()
+    settings = get_settings()
+    enabled = settings.fast_json
+    results = {}
+    try:
+        with TestClient(app) as client:
+            for name, (url, _) in ENDPOINTS.items():
+                for path in ("default", "fast"):
+                    settings.fast_json = path == "fast"
+                    results[f"serialization.{name}.{path}"] = time_calls(
+                        lambda i, url=url: client.get(url).raise_for_status(), repeat
+                    )
+    finally:
+        settings.fast_json = enabled
+
+    for name, call in _encode_benchmarks().items():
+        results[name] = time_calls(call, repeat)
+
+    for name, row in results.items():
+        print(f"  {name:<45} cpu {row['cpu_ms_per_op']:>9.3f} ms  p50 {row['p50_ms']:>9.3f} ms")
+    for prefix in sorted({name.rsplit(".", 1)[0] for name in results}):
+        default, fast = results[f"{prefix}.default"], results[f"{prefix}.fast"]
+        if fast["cpu_ms_per_op"]:
+            print(f"  {prefix}: fast path uses {default['cpu_ms_per_op'] / fast['cpu_ms_per_op']:.1f}x less CPU")
+    return results
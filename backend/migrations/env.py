@@ -0,0 +1,61 @@
+from logging.config import fileConfig
+
+from alembic import context
+
+from app.database import Base, create_db_engine
+from app.config import get_settings
+from app import models  # noqa: F401 - registers the tables on Base.metadata
+
+config = context.config
+
+# Only configure logging when run from the alembic CLI; app.migrations
+# calls in with the app's own logging already set up.
+if config.config_file_name is not None and not config.attributes.get("connection"):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    # Leave tables the models don't know about (the notes_fts search index) alone
+    return not (type_ == "table" and reflected and compare_to is None)
+
+
+def _configure(**kwargs):
+    context.configure(
+        target_metadata=target_metadata,
+        include_object=include_object,
+        render_as_batch=True,  # SQLite needs table rebuilds for most ALTERs
+        **kwargs,
+    )
+
+
+def run_migrations_offline() -> None:
+    _configure(
+        url=get_settings().database_url,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _configure(connection=connection)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    engine = create_db_engine(get_settings().database_url)
+    with engine.connect() as connection:
+        _configure(connection=connection)
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,209 @@
+"""baseline schema
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-17 07:26:22.773616
+
+Every table the app used to create with Base.metadata.create_all().
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Databases created by the old create_all() startup already have some or
+    # all of these tables; only create the ones that are missing.
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'daily_entries' not in existing:
+        op.create_table('daily_entries',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('stress_level', sa.Integer(), nullable=True),
+        sa.Column('worked_out', sa.Boolean(), nullable=True),
+        sa.Column('workout_notes', sa.Text(), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('device_metrics', sa.JSON().with_variant(postgresql.JSONB(astext_type=sa.Text()), 'postgresql'), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('daily_entries', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_daily_entries_date'), ['date'], unique=True)
+            batch_op.create_index(batch_op.f('ix_daily_entries_id'), ['id'], unique=False)
+
+    if 'device_daily_summaries' not in existing:
+        op.create_table('device_daily_summaries',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('metric', sa.String(length=50), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.Column('total', sa.Float(), nullable=False),
+        sa.Column('min_value', sa.Float(), nullable=False),
+        sa.Column('max_value', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('date', 'metric')
+        )
+        with op.batch_alter_table('device_daily_summaries', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_device_daily_summaries_date'), ['date'], unique=False)
+
+    if 'device_hourly_rollups' not in existing:
+        op.create_table('device_hourly_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('metric', sa.String(length=50), nullable=False),
+        sa.Column('hour', sa.DateTime(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.Column('total', sa.Float(), nullable=False),
+        sa.Column('min_value', sa.Float(), nullable=False),
+        sa.Column('max_value', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('metric', 'hour')
+        )
+
+    if 'device_samples' not in existing:
+        op.create_table('device_samples',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('metric', sa.String(length=50), nullable=False),
+        sa.Column('timestamp', sa.DateTime(), nullable=False),
+        sa.Column('value', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('metric', 'timestamp')
+        )
+
+    if 'issue_types' not in existing:
+        op.create_table('issue_types',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('display_name', sa.String(length=100), nullable=False),
+        sa.Column('icon', sa.String(length=50), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('sort_order', sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('name')
+        )
+        with op.batch_alter_table('issue_types', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_issue_types_id'), ['id'], unique=False)
+
+    if 'stats_rollups' not in existing:
+        op.create_table('stats_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('period', sa.String(length=10), nullable=False),
+        sa.Column('period_start', sa.Date(), nullable=False),
+        sa.Column('entry_count', sa.Integer(), nullable=False),
+        sa.Column('workout_count', sa.Integer(), nullable=False),
+        sa.Column('stress_sum', sa.Integer(), nullable=False),
+        sa.Column('stress_count', sa.Integer(), nullable=False),
+        sa.Column('stress_min', sa.Integer(), nullable=True),
+        sa.Column('stress_max', sa.Integer(), nullable=True),
+        sa.Column('issue_counts', sa.JSON(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('period', 'period_start')
+        )
+        with op.batch_alter_table('stats_rollups', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_stats_rollups_id'), ['id'], unique=False)
+
+    if 'workout_routines' not in existing:
+        op.create_table('workout_routines',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('workout_routines', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_workout_routines_id'), ['id'], unique=False)
+
+    if 'health_issues' not in existing:
+        op.create_table('health_issues',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('daily_entry_id', sa.Integer(), nullable=False),
+        sa.Column('issue_type', sa.String(length=100), nullable=False),
+        sa.Column('severity', sa.Integer(), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('time_of_day', sa.String(length=50), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.ForeignKeyConstraint(['daily_entry_id'], ['daily_entries.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('health_issues', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_health_issues_id'), ['id'], unique=False)
+
+    if 'workout_days' not in existing:
+        op.create_table('workout_days',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('routine_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('day_of_week', sa.Integer(), nullable=True),
+        sa.Column('sort_order', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['routine_id'], ['workout_routines.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('workout_days', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_workout_days_id'), ['id'], unique=False)
+
+    if 'exercises' not in existing:
+        op.create_table('exercises',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('workout_day_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('target_sets', sa.Integer(), nullable=True),
+        sa.Column('target_reps', sa.String(length=50), nullable=True),
+        sa.Column('target_weight', sa.String(length=50), nullable=True),
+        sa.Column('rest_seconds', sa.Integer(), nullable=True),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.Column('sort_order', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['workout_day_id'], ['workout_days.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        with op.batch_alter_table('exercises', schema=None) as batch_op:
+            batch_op.create_index(batch_op.f('ix_exercises_id'), ['id'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('exercises', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_exercises_id'))
+
+    op.drop_table('exercises')
+    with op.batch_alter_table('workout_days', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_workout_days_id'))
+
+    op.drop_table('workout_days')
+    with op.batch_alter_table('health_issues', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_health_issues_id'))
+
+    op.drop_table('health_issues')
+    with op.batch_alter_table('workout_routines', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_workout_routines_id'))
+
+    op.drop_table('workout_routines')
+    with op.batch_alter_table('stats_rollups', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_stats_rollups_id'))
+
+    op.drop_table('stats_rollups')
+    with op.batch_alter_table('issue_types', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_issue_types_id'))
+
+    op.drop_table('issue_types')
+    op.drop_table('device_samples')
+    op.drop_table('device_hourly_rollups')
+    with op.batch_alter_table('device_daily_summaries', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_device_daily_summaries_date'))
+
+    op.drop_table('device_daily_summaries')
+    with op.batch_alter_table('daily_entries', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_daily_entries_id'))
+        batch_op.drop_index(batch_op.f('ix_daily_entries_date'))
+
+    op.drop_table('daily_entries')
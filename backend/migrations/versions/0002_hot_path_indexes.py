@@ -0,0 +1,43 @@
+"""hot path indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 07:27:26.324030
+
+Indexes for the foreign keys the hot read paths join and filter on.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+def upgrade() -> None:
+    with op.batch_alter_table('exercises', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_exercises_workout_day_id'), ['workout_day_id'], unique=False)
+
+    with op.batch_alter_table('health_issues', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_health_issues_daily_entry_id'), ['daily_entry_id'], unique=False)
+        batch_op.create_index('ix_health_issues_issue_type_daily_entry_id', ['issue_type', 'daily_entry_id'], unique=False)
+
+    with op.batch_alter_table('workout_days', schema=None) as batch_op:
+        batch_op.create_index('ix_workout_days_routine_id_day_of_week', ['routine_id', 'day_of_week'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('workout_days', schema=None) as batch_op:
+        batch_op.drop_index('ix_workout_days_routine_id_day_of_week')
+
+    with op.batch_alter_table('health_issues', schema=None) as batch_op:
+        batch_op.drop_index('ix_health_issues_issue_type_daily_entry_id')
+        batch_op.drop_index(batch_op.f('ix_health_issues_daily_entry_id'))
+
+    with op.batch_alter_table('exercises', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_exercises_workout_day_id'))
+
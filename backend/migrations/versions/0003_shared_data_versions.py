@@ -0,0 +1,31 @@
+"""shared data versions
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 07:46:14.759545
+
+Per-namespace write counters shared by worker processes.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('data_versions',
+    sa.Column('namespace', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('namespace')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('data_versions')
@@ -0,0 +1,23 @@
+"""Query cache consistency with concurrent writes"""
+from app import crud
+from app.cache import MISSING, query_cache
+from app.database import SessionLocal
+
+
+def test_read_that_overlaps_a_write_is_not_cached(client, seeded, monkeypatch):
+    query_cache.clear()
+    real_query = SessionLocal.class_.query
+
+    def query_then_write(self, *entities):
+        # A write lands (and invalidates) after this read has taken its snapshot
+        crud._data_changed("issue_types")
+        return real_query(self, *entities)
+
+    with SessionLocal() as db:
+        monkeypatch.setattr(SessionLocal.class_, "query", query_then_write)
+        crud.get_issue_types(db)
+        monkeypatch.undo()
+        assert query_cache.get(("issue_types", True)) is MISSING
+
+        crud.get_issue_types(db)
+        assert query_cache.get(("issue_types", True)) is not MISSING
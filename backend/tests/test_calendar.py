@@ -0,0 +1,19 @@
+"""The calendar month view packs issue types into small, dense bitmasks"""
+
+
+def test_issue_bits_are_dense(client):
+    for n in range(40):
+        response = client.post("/api/issue-types", json={"name": f"calendar_{n}", "display_name": f"C{n}"})
+        assert response.status_code == 201
+    client.post("/api/entries", json={"date": "2003-03-03", "health_issues": [{"issue_type": "calendar_39"}]})
+
+    month = client.get("/api/calendar/2003/3").json()
+    bit = {name: int(bit) for bit, name in month["issue_types"].items()}["calendar_39"]
+    assert sorted(int(b) for b in month["issue_types"]) == list(range(len(month["issue_types"])))
+    assert month["issue_mask"] == [1 << bit]
+
+
+def test_last_month_of_year_9999(client):
+    response = client.get("/api/calendar/9999/12")
+    assert response.status_code == 200
+    assert response.json()["dates"] == []
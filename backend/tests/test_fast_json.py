@@ -0,0 +1,51 @@
+"""The FAST_JSON path returns exactly what the response_model path does"""
+import pytest
+
+from app import crud
+from app.config import get_settings
+
+
+@pytest.fixture
+def settings(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "fast_json", False)
+    return settings
+
+
+@pytest.mark.parametrize("url", [
+    "/api/entries?limit=100",
+    "/api/entries?limit=7&skip=3",
+    "/api/entries?limit=0",
+    "/api/workouts",
+    "/api/workouts?active_only=false",
+])
+def test_same_bytes(client, seeded, settings, url):
+    default = client.get(url)
+    settings.fast_json = True
+    fast = client.get(url)
+
+    assert fast.status_code == default.status_code == 200
+    assert fast.content == default.content
+    assert fast.headers.get("X-Next-Cursor") == default.headers.get("X-Next-Cursor")
+    assert fast.headers["ETag"] == default.headers["ETag"]
+
+
+def test_etag_is_weak_when_gzip_is_on(client, seeded, settings, monkeypatch):
+    monkeypatch.setattr(settings, "gzip_min_size", 1)
+    etag = client.get("/api/workouts").headers["ETag"]
+    assert etag.startswith('W/"')
+    assert client.get("/api/workouts", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_no_etag_when_data_changes_while_the_body_is_built(client, seeded, settings, monkeypatch):
+    real_read = crud.get_workout_routines
+
+    def read_during_write(db, **kwargs):
+        routines = real_read(db, **kwargs)
+        crud._data_changed("workouts")
+        return routines
+
+    monkeypatch.setattr(crud, "get_workout_routines", read_during_write)
+    assert "ETag" not in client.get("/api/workouts").headers
+    monkeypatch.undo()
+    assert "ETag" in client.get("/api/workouts").headers
@@ -0,0 +1,43 @@
+"""Hot read endpoints run a fixed number of queries, however much they return"""
+import pytest
+from sqlalchemy import event
+
+from app.database import async_engine, engine
+from app.diagnostics import SlowQueryLog
+
+
+@pytest.mark.parametrize("limit", [10, 50, 100])
+def test_entries_page(client, seeded, queries, limit):
+    # The page, then its issues and device summaries in one query each
+    assert queries.get(client, f"/api/entries?limit={limit}") == 3
+
+
+def test_entries_cursor_page(client, seeded, queries):
+    cursor = client.get("/api/entries?limit=20").headers["X-Next-Cursor"]
+    assert queries.get(client, f"/api/entries?limit=100&cursor={cursor}") == 3
+
+
+def test_entry_by_date(client, seeded, queries):
+    assert queries.get(client, f"/api/entries/{seeded.isoformat()}") == 3
+
+
+def test_today(client, seeded, queries):
+    assert queries.get(client, "/api/today") == 3
+
+
+def test_workouts(client, seeded, queries):
+    # Routines, then all their days and all their exercises in one query each
+    assert queries.get(client, "/api/workouts?active_only=false") == 3
+
+
+def test_slow_query_plans_are_not_counted(client, seeded, queries):
+    slow_log = SlowQueryLog(threshold_ms=0, explain=True)
+    engines = [engine, *([async_engine.sync_engine] if async_engine is not None else [])]
+    for watched in engines:
+        slow_log.install(watched)
+    try:
+        assert queries.get(client, "/api/today") == 3
+    finally:
+        for watched in engines:
+            event.remove(watched, "before_cursor_execute", slow_log._before)
+            event.remove(watched, "after_cursor_execute", slow_log._after)
@@ -0,0 +1,40 @@
+"""The hot lookups are answered from the indexes added in migration 0002"""
+from datetime import date
+
+import pytest
+from sqlalchemy import delete, select
+
+from app import crud, models
+from app.database import engine
+
+pytestmark = pytest.mark.skipif(engine.dialect.name != "sqlite", reason="checks SQLite query plans")
+
+entry, issue, exercise = models.DailyEntry, models.HealthIssue, models.Exercise
+
+
+def query_plan(stmt) -> str:
+    sql = str(stmt.compile(engine, compile_kwargs={"literal_binds": True}))
+    with engine.connect() as conn:
+        return "; ".join(row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+
+
+@pytest.mark.parametrize("stmt, index", [
+    # Issue types joined back to the entries of a date range (stats rollups, calendar)
+    (
+        select(entry.date, issue.issue_type)
+        .join(issue, issue.daily_entry_id == entry.id)
+        .where(entry.date.between(date(2026, 1, 1), date(2026, 1, 31))),
+        "ix_health_issues_daily_entry_id",
+    ),
+    # The entries that logged one issue type
+    (select(issue.daily_entry_id).where(issue.issue_type == "headache"), "ix_health_issues_issue_type_daily_entry_id"),
+    # Replacing the issues of re-imported entries
+    (delete(issue).where(issue.daily_entry_id.in_([1, 2, 3])), "ix_health_issues_daily_entry_id"),
+    # Today's workout
+    (crud._workout_day_stmt(routine_id=1, day_of_week=2), "ix_workout_days_routine_id_day_of_week"),
+    # Exercises selectin-loaded for a page of workout days
+    (select(exercise).where(exercise.workout_day_id.in_([1, 2, 3])), "ix_exercises_workout_day_id"),
+], ids=["issue_join", "issue_type", "issue_delete", "todays_workout_day", "exercises"])
+def test_uses_index(client, stmt, index):
+    plan = query_plan(stmt)
+    assert f"INDEX {index} " in plan, plan
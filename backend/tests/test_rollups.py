@@ -0,0 +1,75 @@
+"""Rollups stay exact when writes race on the same buckets"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from app import devices, models, rollups
+from app.database import SessionLocal, dialect_insert, engine
+
+MONDAY = date(2001, 1, 1)
+
+
+@pytest.mark.skipif(engine.dialect.name == "sqlite", reason="SQLite runs one write transaction at a time")
+def test_concurrent_writes_in_one_week(client):
+    first, second = SessionLocal(), SessionLocal()
+    try:
+        first.add(models.DailyEntry(date=MONDAY, stress_level=2))
+        first.flush()
+        second.add(models.DailyEntry(date=MONDAY + timedelta(days=1), stress_level=4))
+        second.flush()
+
+        rollups.refresh_rollups(first, [MONDAY])
+
+        def refresh_second():
+            rollups.refresh_rollups(second, [MONDAY + timedelta(days=1)])
+            second.commit()
+
+        with ThreadPoolExecutor(1) as pool:
+            pending = pool.submit(refresh_second)
+            time.sleep(0.3)  # let the second refresh reach the buckets the first one holds
+            first.commit()
+            pending.result(timeout=10)
+    finally:
+        first.close()
+        second.close()
+
+    with SessionLocal() as db:
+        week = db.scalars(select(models.StatsRollup).where(
+            models.StatsRollup.period == "week", models.StatsRollup.period_start == MONDAY
+        )).one()
+    assert (week.entry_count, week.stress_sum, week.stress_min, week.stress_max) == (2, 6, 2, 4)
+
+
+@pytest.mark.skipif(engine.dialect.name == "sqlite", reason="SQLite runs one write transaction at a time")
+def test_concurrent_sample_flushes_of_one_metric(client):
+    hour = datetime(2001, 1, 1, 8)
+    first, second = SessionLocal(), SessionLocal()
+    try:
+        first.execute(dialect_insert(first, models.DeviceSample.__table__),
+                      [{"metric": "race_bpm", "timestamp": hour, "value": 60.0}])
+        devices.refresh_daily_summaries(first, {("race_bpm", hour.date())})
+        devices.refresh_hourly_rollups(first, {("race_bpm", hour)})
+
+        with ThreadPoolExecutor(1) as pool:
+            pending = pool.submit(devices.write_samples, second, [
+                {"metric": "race_bpm", "timestamp": hour + timedelta(minutes=1), "value": 80.0},
+            ])
+            time.sleep(0.3)  # let the second flush reach the metric the first one holds
+            first.commit()
+            pending.result(timeout=10)
+    finally:
+        first.close()
+        second.close()
+
+    with SessionLocal() as db:
+        summary = db.scalars(select(models.DeviceDailySummary).where(
+            models.DeviceDailySummary.metric == "race_bpm"
+        )).one()
+        rollup = db.scalars(select(models.DeviceHourlyRollup).where(
+            models.DeviceHourlyRollup.metric == "race_bpm"
+        )).one()
+    assert (summary.count, summary.total, summary.min_value, summary.max_value) == (2, 140.0, 60.0, 80.0)
+    assert (rollup.count, rollup.total) == (2, 140.0)
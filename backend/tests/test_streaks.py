@@ -0,0 +1,20 @@
+"""Streaks in /api/stats"""
+from datetime import date, timedelta
+
+from app import crud, models
+from app.database import SessionLocal
+
+
+def test_entries_after_today_do_not_end_the_current_streak(client, seeded):
+    today = date.today()
+    with SessionLocal() as db:
+        streak_before, _ = crud.get_streaks(db)
+        assert streak_before > 0
+        tomorrow = today + timedelta(days=1)
+        db.add(models.DailyEntry(date=tomorrow))
+        db.commit()
+        try:
+            assert crud.get_streaks(db)[0] == streak_before
+        finally:
+            db.query(models.DailyEntry).filter(models.DailyEntry.date == tomorrow).delete()
+            db.commit()
@@ -0,0 +1,12 @@
+"""Trend ranges near date.min are rejected instead of overflowing the rolling windows"""
+import pytest
+
+
+@pytest.mark.parametrize("query, status", [
+    ("start_date=0001-01-05&end_date=0001-02-01", 400),
+    ("end_date=0001-01-10", 400),
+    ("start_date=0001-01-30&end_date=0001-02-01", 200),
+    ("end_date=0001-02-15", 200),
+])
+def test_earliest_dates(client, query, status):
+    assert client.get(f"/api/analytics/trends?{query}").status_code == status
@@ -10,6 +10,22 @@ export interface HealthIssue {
   created_at?: string;
 }
 
+export interface HealthIssueToggle {
+  issue_type: string;
+  time_of_day?: string | null;
+  severity?: number | null;
+  notes?: string | null;
+  selected: boolean;
+}
+
+export interface DeviceDailySummary {
+  metric: string;
+  count: number;
+  total: number;
+  min_value: number;
+  max_value: number;
+}
+
 export interface DailyEntry {
   id?: number;
   date: string;
@@ -19,6 +35,7 @@ export interface DailyEntry {
   notes: string | null;
   health_issues: HealthIssue[];
   device_metrics?: Record<string, unknown> | null;
+  device_summaries?: DeviceDailySummary[];
   created_at?: string;
   updated_at?: string | null;
 }
@@ -36,8 +53,78 @@ export interface Stats {
   total_entries: number;
   workout_days: number;
   avg_stress: number | null;
+  min_stress: number | null;
+  max_stress: number | null;
   common_issues: Array<{ type: string; count: number }>;
   streak_days: number;
+  longest_streak_days: number;
+}
+
+export interface CalendarMonth {
+  year: number;
+  month: number;
+  issue_types: Record<string, string>;
+  dates: string[];
+  stress_level: (number | null)[];
+  worked_out: boolean[];
+  issue_mask: number[];
+  issue_count: number[];
+}
+
+export interface Trends {
+  start_date: string;
+  end_date: string;
+  dates: string[];
+  stress_mean_7d: (number | null)[];
+  stress_mean_30d: (number | null)[];
+  workout_rate_7d: (number | null)[];
+  workout_rate_30d: (number | null)[];
+  issue_incidence: Record<string, (number | null)[]>;
+}
+
+export interface IssueCorrelation {
+  issue_type: string;
+  days_with_issue: number;
+  base_rate: number | null;
+  rate_high_stress: number | null;
+  rate_low_stress: number | null;
+  rate_workout: number | null;
+  rate_no_workout: number | null;
+  stress_correlation: (number | null)[];
+  workout_correlation: (number | null)[];
+}
+
+export interface CorrelationReport {
+  days_analyzed: number;
+  high_stress_threshold: number;
+  max_lag: number;
+  issues: IssueCorrelation[];
+}
+
+export interface MetricSeries {
+  metric: string;
+  bucket: 'hour' | 'day' | 'week' | 'month';
+  start: string;
+  end: string;
+  timestamps: string[];
+  count: number[];
+  min: number[];
+  max: number[];
+  avg: number[];
+}
+
+export interface SearchHit {
+  kind: 'notes' | 'workout_notes' | 'issue';
+  entry_id: number;
+  date: string;
+  snippet: string;
+  rank: number;
+}
+
+export interface SearchResults {
+  query: string;
+  total: number;
+  hits: SearchHit[];
 }
 
 export interface Exercise {
@@ -97,10 +184,11 @@ async function fetchApi<T>(
 
 export const api = {
   // Entries
-  getEntries: (params?: { start_date?: string; end_date?: string; limit?: number }) => {
+  getEntries: (params?: { start_date?: string; end_date?: string; before?: string; limit?: number }) => {
     const query = new URLSearchParams();
     if (params?.start_date) query.set('start_date', params.start_date);
     if (params?.end_date) query.set('end_date', params.end_date);
+    if (params?.before) query.set('before', params.before);
     if (params?.limit) query.set('limit', params.limit.toString());
     const queryStr = query.toString();
     return fetchApi<DailyEntry[]>(`/entries${queryStr ? `?${queryStr}` : ''}`);
@@ -122,9 +210,18 @@ export const api = {
       body: JSON.stringify(entry),
     }),
 
+  toggleIssue: (date: string, toggle: HealthIssueToggle) =>
+    fetchApi<DailyEntry>(`/entries/${date}/issues`, {
+      method: 'PATCH',
+      body: JSON.stringify(toggle),
+    }),
+
   deleteEntry: (date: string) =>
     fetchApi<void>(`/entries/${date}`, { method: 'DELETE' }),
 
+  getCalendar: (year: number, month: number) =>
+    fetchApi<CalendarMonth>(`/calendar/${year}/${month}`),
+
   // Issue Types
   getIssueTypes: () => fetchApi<IssueType[]>('/issue-types'),
 
@@ -137,6 +234,29 @@ export const api = {
   // Stats
   getStats: (days = 30) => fetchApi<Stats>(`/stats?days=${days}`),
 
+  getTrends: (params?: { start_date?: string; end_date?: string }) => {
+    const query = new URLSearchParams();
+    if (params?.start_date) query.set('start_date', params.start_date);
+    if (params?.end_date) query.set('end_date', params.end_date);
+    const queryStr = query.toString();
+    return fetchApi<Trends>(`/analytics/trends${queryStr ? `?${queryStr}` : ''}`);
+  },
+
+  getCorrelations: (highStress = 7, maxLag = 3) =>
+    fetchApi<CorrelationReport>(`/analytics/correlations?high_stress=${highStress}&max_lag=${maxLag}`),
+
+  getMetricSeries: (name: string, params?: { start?: string; end?: string; bucket?: MetricSeries['bucket'] }) => {
+    const query = new URLSearchParams();
+    if (params?.start) query.set('start', params.start);
+    if (params?.end) query.set('end', params.end);
+    if (params?.bucket) query.set('bucket', params.bucket);
+    const queryStr = query.toString();
+    return fetchApi<MetricSeries>(`/metrics/${name}${queryStr ? `?${queryStr}` : ''}`);
+  },
+
+  search: (q: string, skip = 0, limit = 20) =>
+    fetchApi<SearchResults>(`/search?${new URLSearchParams({ q, skip: String(skip), limit: String(limit) })}`),
+
   // Health check
   health: () => fetchApi<{ status: string }>('/health'),
 
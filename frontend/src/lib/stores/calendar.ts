@@ -0,0 +1,64 @@
+import { writable } from 'svelte/store';
+import { api, type CalendarMonth } from '$lib/api';
+
+// What a calendar cell shows for a logged day
+export interface CalendarDay {
+  stress_level: number | null;
+  worked_out: boolean;
+  issue_count: number;
+}
+
+function monthPrefix(year: number, month: number): string {
+  return `${year}-${String(month).padStart(2, '0')}-`;
+}
+
+function createCalendarStore() {
+  // Logged days of every month fetched so far, by date
+  const { subscribe, update } = writable<Map<string, CalendarDay>>(new Map());
+  const requested = new Set<string>();
+
+  function merge(data: CalendarMonth) {
+    const prefix = monthPrefix(data.year, data.month);
+    update(days => {
+      const next = new Map([...days].filter(([date]) => !date.startsWith(prefix)));
+      data.dates.forEach((date, i) => {
+        next.set(date, {
+          stress_level: data.stress_level[i],
+          worked_out: data.worked_out[i],
+          issue_count: data.issue_count[i]
+        });
+      });
+      return next;
+    });
+  }
+
+  async function fetchMonth(year: number, month: number) {
+    const prefix = monthPrefix(year, month);
+    requested.add(prefix);
+    try {
+      merge(await api.getCalendar(year, month));
+    } catch (e) {
+      requested.delete(prefix);
+      console.error('Failed to load calendar:', e);
+    }
+  }
+
+  return {
+    subscribe,
+
+    // month is 1-12; each month is fetched once until refresh() replaces it
+    async load(year: number, month: number) {
+      if (!requested.has(monthPrefix(year, month))) {
+        await fetchMonth(year, month);
+      }
+    },
+
+    // Refetch the month containing date (YYYY-MM-DD) after an entry changed
+    async refresh(date: string) {
+      const [year, month] = date.split('-').map(Number);
+      await fetchMonth(year, month);
+    }
+  };
+}
+
+export const calendar = createCalendarStore();
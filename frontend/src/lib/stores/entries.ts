@@ -1,8 +1,9 @@
 import { writable, derived } from 'svelte/store';
 import { api, type DailyEntry } from '$lib/api';
+import { calendar } from './calendar';
 
 function createEntriesStore() {
-  const { subscribe, set, update } = writable<DailyEntry[]>([]);
+  const { subscribe, update } = writable<DailyEntry[]>([]);
   const loading = writable(false);
   const error = writable<string | null>(null);
 
@@ -11,14 +12,15 @@ function createEntriesStore() {
     loading,
     error,
 
-    async load(startDate?: string, endDate?: string) {
+    // The calendar grid reads the compact calendar store; full entries are only needed to edit a day
+    async loadDate(date: string) {
       loading.set(true);
       error.set(null);
       try {
-        const entries = await api.getEntries({ start_date: startDate, end_date: endDate, limit: 100 });
-        set(entries);
+        const [entry] = await api.getEntries({ start_date: date, end_date: date, limit: 1 });
+        update(entries => [...entries.filter(e => e.date !== date), ...(entry ? [entry] : [])]);
       } catch (e) {
-        error.set(e instanceof Error ? e.message : 'Failed to load entries');
+        error.set(e instanceof Error ? e.message : 'Failed to load entry');
       } finally {
         loading.set(false);
       }
@@ -30,6 +32,7 @@ function createEntriesStore() {
       try {
         const newEntry = await api.createEntry(entry);
         update(entries => [newEntry, ...entries]);
+        calendar.refresh(newEntry.date);
         return newEntry;
       } catch (e) {
         error.set(e instanceof Error ? e.message : 'Failed to create entry');
@@ -45,6 +48,7 @@ function createEntriesStore() {
       try {
         const updated = await api.updateEntry(date, entry);
         update(entries => entries.map(e => e.date === date ? updated : e));
+        calendar.refresh(date);
         return updated;
       } catch (e) {
         error.set(e instanceof Error ? e.message : 'Failed to update entry');
@@ -60,6 +64,7 @@ function createEntriesStore() {
       try {
         await api.deleteEntry(date);
         update(entries => entries.filter(e => e.date !== date));
+        calendar.refresh(date);
       } catch (e) {
         error.set(e instanceof Error ? e.message : 'Failed to delete entry');
         throw e;